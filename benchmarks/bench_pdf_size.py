@@ -0,0 +1,51 @@
+# benchmarks/bench_pdf_size.py
+# Report PDF size and build time per output-size mode (matplotlib charts). "full + A85" is the
+# previous output, with ASCII85-encoded streams. Charts are rendered up front; cold builds include
+# resampling and re-encoding them for the mode, warm builds reuse those from the chart cache.
+#   python benchmarks/bench_pdf_size.py [--reports 5] [--dpi 150]
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import report
+from bench_report import random_user
+from questionnaire import career_clusters
+from recommender import recommend_careers
+from scoring import prepare_client_profile
+
+MODES = [("full + A85", "full", True), ("full", "full", False), ("lossless", "lossless", False), ("lossy", "lossy", False)]
+
+
+def build(inputs, size_mode):
+    profile, recommendations = inputs
+    start = time.perf_counter()
+    pdf = report.generate_pdf_report(profile, recommendations, {}, size_mode=size_mode).getvalue()
+    return len(pdf), time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=5)
+    parser.add_argument("--dpi", type=int, default=report.REPORT_IMAGE_DPI)
+    args = parser.parse_args()
+    report.CHART_BACKEND = "matplotlib"
+    report.REPORT_IMAGE_DPI = args.dpi
+
+    reports = []
+    for seed in range(args.reports):
+        profile = prepare_client_profile(random_user(seed))
+        reports.append((profile, recommend_careers(profile, career_clusters)))
+        report.render_charts(*reports[-1], size_mode="full")
+
+    print(f"{args.reports} reports, images at {args.dpi} dpi in the resampled modes")
+    print(f"{'mode':<12} {'KB/report':>10} {'cold ms':>9} {'warm ms':>9}")
+    for label, size_mode, ascii85 in MODES:
+        report.PDF_ASCII85 = ascii85
+        # Each mode caches its own chart images, so its first pass over the users is cold
+        cold = [build(inputs, size_mode) for inputs in reports]
+        warm = [build(inputs, size_mode) for inputs in reports]
+        size = sum(size for size, _ in warm) / len(warm)
+        print(f"{label:<12} {size / 1024:10.0f} {sum(t for _, t in cold) * 1e3 / len(cold):9.0f} {sum(t for _, t in warm) * 1e3 / len(warm):9.0f}")
@@ -0,0 +1,100 @@
+# benchmarks/bench_recommend.py
+# Compares the vectorized recommender with the original per-career loop.
+#   python benchmarks/bench_recommend.py [--users 2000]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from questionnaire import career_clusters
+from recommender import recommend_careers, recommend_careers_batch, get_career_matrix, parse_dimensions, CORRELATION_DECIMALS
+
+RIASEC = ["Realistic", "Investigative", "Artistic", "Social", "Enterprising", "Conventional"]
+RIASEC_ONLY = parse_dimensions("RIASEC:correlation:1")
+ALL_DIMENSIONS = parse_dimensions("RIASEC:correlation:0.4,OCEAN:correlation:0.2,Aptitude:distance:0.3,Hofstede:cosine:0.1")
+
+
+def legacy_recommend_careers(client_profile, career_clusters):
+    # The original implementation, kept here as the reference for ranking and timing
+    recommendations = []
+    for career, profile in career_clusters.items():
+        client_riasec = client_profile['RIASEC']
+        career_riasec = profile['RIASEC']
+
+        if np.std(list(client_riasec.values())) == 0 or np.std(list(career_riasec.values())) == 0:
+            riasec_similarity = 0
+        else:
+            riasec_similarity = np.corrcoef(list(client_riasec.values()), list(career_riasec.values()))[0, 1]
+
+        score = (riasec_similarity + 1) * 50
+
+        if not np.isnan(score):
+            match_level = (
+                "Best Fit" if riasec_similarity >= 0.7 else
+                "Great Fit" if riasec_similarity >= 0.5 else
+                "Good Fit" if riasec_similarity > 0 else
+                "Not a Strong Match"
+            )
+            recommendations.append((career, score, match_level))
+
+    recommendations.sort(key=lambda x: x[1], reverse=True)
+    return recommendations
+
+def random_profiles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    first = next(iter(career_clusters.values()))
+    profiles = [{} for _ in range(n)]
+    for dimension, traits in first.items():
+        # Likert averages over 10 items land on a 0.25 grid between 0 and 10
+        scores = rng.integers(0, 41, size=(n, len(traits))) * 0.25
+        for profile, row in zip(profiles, scores):
+            profile[dimension] = dict(zip(traits, map(float, row)))
+    return profiles
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=2000)
+    args = parser.parse_args()
+
+    profiles = random_profiles(args.users)
+    # Compile outside the timed region, as the app does once per process
+    get_career_matrix(career_clusters, RIASEC_ONLY)
+    get_career_matrix(career_clusters, ALL_DIMENSIONS)
+
+    legacy, legacy_time = timed(lambda: [legacy_recommend_careers(p, career_clusters) for p in profiles])
+    single, single_time = timed(lambda: [recommend_careers(p, career_clusters, RIASEC_ONLY) for p in profiles])
+    batch, batch_time = timed(recommend_careers_batch, profiles, career_clusters, RIASEC_ONLY)
+    _, composite_time = timed(lambda: [recommend_careers(p, career_clusters, ALL_DIMENSIONS) for p in profiles])
+    _, composite_batch_time = timed(recommend_careers_batch, profiles, career_clusters, ALL_DIMENSIONS)
+
+    # Rankings must agree score for score and match levels career for career. The one exception is a
+    # correlation exactly on a match_level threshold (r = 0, 0.5 or 0.7), where the loop's call is
+    # decided by rounding noise from np.corrcoef.
+    tolerance = 10.0 ** -CORRELATION_DECIMALS * 50 * 10
+    thresholds = [50.0, 75.0, 85.0]
+    for expected, *actual in zip(legacy, single, batch):
+        expected_levels = {c: (s, m) for c, s, m in expected}
+        for result in actual:
+            assert np.allclose([s for _, s, _ in result], [s for _, s, _ in expected], rtol=0, atol=tolerance)
+            for career, score, match in result:
+                legacy_score, legacy_match = expected_levels[career]
+                assert abs(score - legacy_score) <= tolerance
+                assert match == legacy_match or min(abs(legacy_score - t) for t in thresholds) <= tolerance
+
+    n = len(profiles)
+    print(f"{n} users x {len(career_clusters)} careers, rankings and match levels match the original loop")
+    print(f"legacy loop:        {legacy_time * 1e6 / n:8.1f} us/user")
+    print(f"vectorized, single: {single_time * 1e6 / n:8.1f} us/user ({legacy_time / single_time:.1f}x)")
+    print(f"vectorized, batch:  {batch_time * 1e6 / n:8.1f} us/user ({legacy_time / batch_time:.1f}x)")
+    print(f"all 4 dimensions, single: {composite_time * 1e6 / n:8.1f} us/user ({legacy_time / composite_time:.1f}x)")
+    print(f"all 4 dimensions, batch:  {composite_batch_time * 1e6 / n:8.1f} us/user ({legacy_time / composite_batch_time:.1f}x)")
@@ -0,0 +1,89 @@
+# benchmarks/bench_report.py
+# Per-report PDF build time with the stylesheet, table styles and static flowables built once per
+# process, against paying that build again for every report as before; also checks that concurrent
+# builds sharing the templates produce identical PDFs.
+#   python benchmarks/bench_report.py [--reports 20] [--threads 4]
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("CHART_BACKEND", "vector")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab import rl_config
+
+import report
+import report_templates
+from questionnaire import questions, aptitude_questions, career_clusters
+from recommender import recommend_careers
+from scoring import prepare_client_profile
+
+# Fixed document ids and timestamps, so the same inputs give byte-identical PDFs
+rl_config.invariant = 1
+
+
+def random_user(seed):
+    rng = random.Random(seed)
+    user_data = {'name': f"User {seed}", 'email': 'user@example.com', 'age': 17, 'phone': '',
+                 'class_or_occupation': 'College', 'hobbies': 'Reading', 'interests': 'Science', 'passion': 'Music'}
+    for section, traits in questions.items():
+        answers = user_data.setdefault(section, {})
+        for trait, items in traits.items():
+            for i, (_, options) in enumerate(items, 1):
+                answers[f"{section}_{trait}_{i}"] = rng.choice(options)
+    aptitude = user_data.setdefault('Aptitude', {})
+    for trait, items in aptitude_questions.items():
+        correct = 0
+        for i, (_, options, answer) in enumerate(items, 1):
+            aptitude[f"aptitude_{trait}_{i}"] = choice = rng.choice(options)
+            correct += choice == answer
+        aptitude[trait] = correct / len(items) * 100
+    return user_data
+
+def build(inputs):
+    # Empty narratives fall back to the built-in texts
+    profile, recommendations = inputs
+    return report.generate_pdf_report(profile, recommendations, {}).getvalue()
+
+def build_rebuilding_templates(inputs):
+    report_templates._build_styles()
+    report_templates._build_static_flowables()
+    return build(inputs)
+
+def per_report(fn, reports):
+    start = time.process_time()
+    results = [fn(inputs) for inputs in reports]
+    return results, (time.process_time() - start) * 1e3 / len(reports)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    reports = []
+    for seed in range(args.reports):
+        profile = prepare_client_profile(random_user(seed))
+        reports.append((profile, recommend_careers(profile, career_clusters)))
+    build(reports[0])  # warm up fonts, chart caches and imports
+
+    start = time.process_time()
+    report_templates._build_styles()
+    report_templates._build_static_flowables()
+    template_ms = (time.process_time() - start) * 1e3
+
+    rebuilt, rebuilt_ms = per_report(build_rebuilding_templates, reports)
+    shared, shared_ms = per_report(build, reports)
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        concurrent = list(executor.map(build, reports))
+
+    print(f"chart backend {report.CHART_BACKEND}, {args.reports} reports")
+    print(f"template build          {template_ms:8.1f} ms (once per process)")
+    print(f"rebuilt per report      {rebuilt_ms:8.1f} ms/report CPU")
+    print(f"built once              {shared_ms:8.1f} ms/report CPU  ({rebuilt_ms / shared_ms:.2f}x)")
+    print(f"identical to rebuilt:   {shared == rebuilt}")
+    print(f"identical across {args.threads} threads: {concurrent == shared}")
@@ -0,0 +1,57 @@
+# benchmarks/bench_startup.py
+# Cold-start import cost of app.py, from `python -X importtime`, checked against a budget. Fails
+# (exit status 1) when importing the app goes over budget or loads a dependency that should only be
+# loaded once a report is generated.
+#   python benchmarks/bench_startup.py [--runs 5] [--budget-ms 900] [--top 12]
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Loaded on first use through lazy_import (or, for scikit-learn, only for very large catalogs)
+DEFERRED_MODULES = ['matplotlib', 'reportlab', 'PIL', 'google.generativeai', 'gspread', 'oauth2client', 'sklearn', 'pyarrow']
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)')
+
+
+def import_times():
+    # (cumulative ms for app, [(module imported directly by app, cumulative ms)], every module app loaded)
+    # for one fresh interpreter. Children are printed before their parent, one level deeper.
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=ROOT, capture_output=True, text=True)
+    children, modules = [], []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        depth, module, cumulative = (len(match.group(3)) - 1) // 2, match.group(4), int(match.group(2)) / 1e3
+        if depth == 0:
+            if module == 'app':
+                return cumulative, children, modules
+            children, modules = [], []
+        else:
+            modules.append(module)
+            if depth == 1:
+                children.append((module, cumulative))
+    sys.exit(f"Importing app failed:\n{result.stderr[-2000:]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=900)
+    parser.add_argument("--top", type=int, default=12)
+    args = parser.parse_args()
+
+    # The fastest run is the least disturbed by the machine; the first one also warms the disk cache
+    total_ms, children, modules = min((import_times() for _ in range(args.runs)), key=lambda run: run[0])
+
+    print(f"import app: {total_ms:.0f} ms (best of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    # Modules imported directly by app, including everything each one pulled in
+    for module, ms in sorted(children, key=lambda child: -child[1])[:args.top]:
+        print(f"{ms:8.1f} ms  {module}")
+
+    loaded = sorted({prefix for module in modules for prefix in DEFERRED_MODULES if module == prefix or module.startswith(prefix + '.')})
+    if loaded:
+        print(f"Loaded at startup but should be deferred: {', '.join(loaded)}")
+    sys.exit(1 if loaded or total_ms > args.budget_ms else 0)
@@ -0,0 +1,65 @@
+# benchmarks/bench_topk.py
+# Top-k query latency as the occupation catalog grows: full ranking vs exact argpartition vs ball tree.
+#   python benchmarks/bench_topk.py [--sizes 1000 10000 100000] [--top 10]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recommender
+from recommender import CareerMatrix, parse_dimensions
+from bench_recommend import random_profiles
+
+DIMENSIONS = parse_dimensions(os.environ.get("MATCH_DIMENSIONS", "RIASEC:correlation:1"))
+TRAITS = {
+    'RIASEC': ["Realistic", "Investigative", "Artistic", "Social", "Enterprising", "Conventional"],
+    'OCEAN': ["Openness", "Conscientiousness", "Extraversion", "Agreeableness", "Neuroticism"],
+    'Hofstede': ["PDI", "IDV", "MAS", "UAI", "LTO", "IVR"]
+}
+
+
+def synthetic_catalog(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        f"Occupation {i}": {dimension: dict(zip(traits, map(int, rng.integers(1, 11, len(traits))))) for dimension, traits in TRAITS.items()}
+        for i in range(size)
+    }
+
+def per_query(fn, queries):
+    start = time.perf_counter()
+    results = [fn(q) for q in queries]
+    return results, (time.perf_counter() - start) * 1e3 / len(queries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    queries = random_profiles(args.queries, seed=1)
+    if recommender._ball_tree_class() is None:
+        print("scikit-learn is not installed; the ball-tree column is skipped")
+
+    print(f"{'careers':>8} {'full sort':>10} {'argpartition':>13} {'ball tree':>10}   (ms/query, top {args.top})")
+    for size in args.sizes:
+        matrix = CareerMatrix(synthetic_catalog(size), DIMENSIONS)
+
+        recommender.CAREER_INDEX_MIN_SIZE = float('inf')
+        _, full_ms = per_query(lambda q: matrix.top_k([q], size), queries)
+        exact, exact_ms = per_query(lambda q: matrix.top_k([q], args.top), queries)
+
+        tree_ms = float('nan')
+        if recommender._ball_tree_class() is not None:
+            recommender.CAREER_INDEX_MIN_SIZE = 0
+            matrix._get_tree()  # built once per process, outside the timed region
+            indexed, tree_ms = per_query(lambda q: matrix.top_k([q], args.top), queries)
+            for (_, expected), (_, actual) in zip((r[0] for r in exact), (r[0] for r in indexed)):
+                assert np.allclose(expected, actual), "ball tree and exact search disagree"
+
+        print(f"{size:>8} {full_ms:>10.3f} {exact_ms:>13.3f} {tree_ms:>10.3f}")
@@ -0,0 +1,143 @@
+# bulk_score.py
+# Re-scores archived submissions (e.g. after the weights in questionnaire.py change).
+#   python bulk_score.py submissions.jsonl scored.jsonl [--workers 8] [--chunk-size 500] [--resume]
+# Input is JSONL (one user_data dict per line) or CSV. CSV columns map to user_data keys; a dotted
+# column such as "RIASEC.RIASEC_Realistic_1" or "Aptitude.V" fills the nested section dicts. A row
+# may instead carry its answers as a "responses" field, the hex of ResponseVector.to_bytes(), which
+# is decoded straight into the chunk's response matrix.
+# Output is JSONL, one record per input row, written in input order as chunks finish.
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from scoring import profile_details, calculate_section_scores, score_response_matrix, APTITUDE, SECTION_TRAITS
+from responses import ResponseVector, stack_responses
+from recommender import recommend_careers_batch, parse_dimensions, MATCH_DIMENSIONS
+from questionnaire import career_clusters
+
+
+def read_rows(path):
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                yield _unflatten_csv_row(row)
+    else:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def _unflatten_csv_row(row):
+    user_data = {}
+    for column, value in row.items():
+        if value in (None, ''):
+            continue
+        section, _, key = column.partition('.')
+        if key:
+            # Aptitude trait totals are the only numeric answers; every other answer is an option label
+            user_data.setdefault(section, {})[key] = float(value) if section == 'Aptitude' and key in APTITUDE else value
+        else:
+            user_data[column] = int(float(value)) if column == 'age' else value
+    return user_data
+
+def encode_responses(user_data):
+    if 'responses' in user_data:
+        return ResponseVector.from_bytes(bytes.fromhex(user_data['responses']))
+    return ResponseVector.from_user_data(user_data)
+
+def prepare_profiles(rows):
+    # Same profiles as scoring.prepare_client_profile row by row (given the row's ResponseVector when
+    # it has one), but the chunk's answers form one uint8 response matrix scored in a single pass.
+    # Rows with answer dicts hold saved aptitude percentages rather than item answers, so those are
+    # read as they are.
+    scores = score_response_matrix(stack_responses([encode_responses(user_data) for user_data in rows]))
+    profiles = []
+    for i, user_data in enumerate(rows):
+        profile = profile_details(user_data)
+        for section, traits in SECTION_TRAITS.items():
+            if section == 'Aptitude' and 'responses' not in user_data:
+                profile[section] = calculate_section_scores(section, user_data)
+            else:
+                profile[section] = {trait: float(score) for trait, score in zip(traits, scores[section][i])}
+        profiles.append(profile)
+    return profiles
+
+def score_chunk(start, rows, dimensions, top_n):
+    profiles = prepare_profiles(rows)
+    recommendations = recommend_careers_batch(profiles, career_clusters, dimensions, top_n)
+    return [
+        json.dumps({'row': start + i, 'profile': profile, 'recommendations': ranked}, default=str)
+        for i, (profile, ranked) in enumerate(zip(profiles, recommendations))
+    ]
+
+def count_completed(path):
+    # Rows already written by an earlier run; a torn final line is dropped so it gets redone
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb+') as f:
+        data = f.read()
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            f.truncate(complete)
+    return data[:complete].count(b'\n')
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+def bulk_score(input_path, output_path, workers, chunk_size, resume, dimensions, top_n):
+    skip = count_completed(output_path) if resume else 0
+    rows = islice(read_rows(input_path), skip, None)
+    written = 0
+    start_time = time.perf_counter()
+
+    with open(output_path, 'a' if resume else 'w', encoding='utf-8') as out, ProcessPoolExecutor(max_workers=workers) as executor:
+        # At most two chunks per worker are in flight, so memory stays bounded whatever the input size
+        pending = deque()
+        start = skip
+        for chunk in chunked(rows, chunk_size):
+            pending.append(executor.submit(score_chunk, start, chunk, dimensions, top_n))
+            start += len(chunk)
+            if len(pending) >= 2 * workers:
+                written += _write(out, pending.popleft().result())
+                _report(written, start_time)
+        while pending:
+            written += _write(out, pending.popleft().result())
+            _report(written, start_time)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"\nScored {written} rows in {elapsed:.1f}s ({written / elapsed if elapsed else 0:.0f} rows/sec); skipped {skip} already done", file=sys.stderr)
+
+def _write(out, lines):
+    out.write('\n'.join(lines) + '\n')
+    out.flush()
+    return len(lines)
+
+def _report(written, start_time):
+    elapsed = time.perf_counter() - start_time
+    print(f"\r{written} rows, {written / elapsed if elapsed else 0:.0f} rows/sec", end='', file=sys.stderr, flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score archived questionnaire submissions.")
+    parser.add_argument("input", help="JSONL or CSV file of user_data records")
+    parser.add_argument("output", help="JSONL file to write scored records to")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--resume", action="store_true", help="Skip rows already present in the output file")
+    parser.add_argument("--dimensions", help="Matching dimensions, as in MATCH_DIMENSIONS")
+    parser.add_argument("--top", type=int, default=None, help="Keep only the best N careers per row")
+    args = parser.parse_args()
+
+    dimensions = parse_dimensions(args.dimensions) if args.dimensions else MATCH_DIMENSIONS
+    bulk_score(args.input, args.output, args.workers, args.chunk_size, args.resume, dimensions, args.top)
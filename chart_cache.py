@@ -0,0 +1,48 @@
+# chart_cache.py
+# Rendered report charts, keyed by chart type plus the exact data plotted. Trait scores take few
+# distinct values (aptitude is a count out of 8, Likert traits average a handful of 2.5-point steps),
+# so identical charts recur across users and reruns. Imported once per process, like gemini_client.
+import os
+import sqlite3
+import sys
+from io import BytesIO
+
+from cache_store import MemoryCache, SQLiteCache, make_cache_key
+
+CHART_CACHE_MAX_MB = float(os.environ.get("CHART_CACHE_MAX_MB", 32))
+# Set CHART_CACHE_PATH to also keep charts on disk, shared between processes and restarts
+CHART_CACHE_PATH = os.environ.get("CHART_CACHE_PATH", "")
+CHART_CACHE_DISK_MAX_MB = float(os.environ.get("CHART_CACHE_DISK_MAX_MB", 128))
+CHART_CACHE_TTL = float(os.environ.get("CHART_CACHE_TTL", 30 * 24 * 3600))
+# Bump whenever a chart's look changes so stale images on disk are not reused
+CHART_STYLE_VERSION = 1
+
+_memory_cache = MemoryCache(int(CHART_CACHE_MAX_MB * 1024 * 1024))
+try:
+    _disk_cache = SQLiteCache(CHART_CACHE_PATH, CHART_CACHE_TTL, int(CHART_CACHE_DISK_MAX_MB * 1024 * 1024)) if CHART_CACHE_PATH else None
+except (OSError, sqlite3.Error) as e:
+    # A cache that cannot be opened only leaves charts in memory
+    print(f"Chart disk cache disabled: could not open {CHART_CACHE_PATH}: {e}", file=sys.stderr)
+    _disk_cache = None
+
+
+def cached_chart(kind, data, render):
+    # data must be JSON-serializable and determine the chart completely; render() returns a BytesIO
+    key = make_cache_key(CHART_STYLE_VERSION, kind, data)
+    image = _memory_cache.get(key)
+    if image is None and _disk_cache is not None:
+        image = _disk_cache.get(key)
+        if image is not None:
+            _memory_cache.set(key, image)
+    if image is None:
+        image = render().getvalue()
+        _memory_cache.set(key, image)
+        if _disk_cache is not None:
+            _disk_cache.set(key, image)
+    return BytesIO(image)
+
+def get_chart_cache_stats():
+    return {
+        'memory': _memory_cache.stats(),
+        'disk': _disk_cache.stats() if _disk_cache is not None else None
+    }
@@ -0,0 +1,135 @@
+# chart_renderer.py
+# Report charts rendered with matplotlib's object-oriented API (Figure + Agg canvas, no pyplot),
+# so several sessions or worker threads can render at once. Pre-laid-out template figures are kept
+# per chart layout and shared by all threads; a render only updates the data artists before saving.
+import threading
+from contextlib import contextmanager
+from io import BytesIO
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Same colours as the report palette in app.py (apple_blue, apple_green)
+BAR_COLOR = (0, 113/255, 227/255)
+ACCENT_COLOR = (52/255, 199/255, 89/255)
+CHART_DPI = 300
+
+# Free templates per layout key. Report stages run on short-lived threads, so templates belong to
+# the process rather than a thread; each render checks one out and hands it back when saved.
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def _new_figure(figsize, **subplot_kw):
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot(**subplot_kw)
+
+@contextmanager
+def _template(key, build):
+    # A template no other render is using; a new one is built only when all are checked out
+    with _templates_lock:
+        free = _templates.setdefault(key, [])
+        template = free.pop() if free else None
+    if template is None:
+        template = build()
+    try:
+        yield template
+    finally:
+        with _templates_lock:
+            _templates[key].append(template)
+
+def _save(fig, **kwargs):
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=CHART_DPI, **kwargs)
+    buf.seek(0)
+    return buf
+
+
+# --- Aptitude bars ---
+def _build_aptitude(traits):
+    fig, ax = _new_figure((6, 4))
+    bars = ax.bar(traits, [0] * len(traits), color=BAR_COLOR)
+    ax.set_ylim(0, 100)
+    ax.set_title("Aptitude Profile")
+    ax.set_ylabel("Score (%)")
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    fig.tight_layout()
+    return fig, bars
+
+def render_aptitude(traits, scores):
+    # scores on 0-100
+    with _template(('aptitude', tuple(traits)), lambda: _build_aptitude(traits)) as (fig, bars):
+        for bar, score in zip(bars, scores):
+            bar.set_height(score)
+        return _save(fig)
+
+
+# --- Trait radar ---
+def _build_radar(traits, title):
+    fig, ax = _new_figure((6, 4), projection='polar')
+    angles = np.linspace(0, 2*np.pi, len(traits), endpoint=False)
+    closed = np.append(angles, angles[0])
+    line, = ax.plot(closed, np.zeros(len(closed)), 'o-', linewidth=2, color=ACCENT_COLOR)
+    fill, = ax.fill(closed, np.zeros(len(closed)), alpha=0.25, color=ACCENT_COLOR)
+    ax.set_thetagrids(np.degrees(angles), traits)
+    ax.set_ylim(0, 10)
+    ax.spines['polar'].set_visible(False)
+    ax.set_title(title, fontweight='bold', fontsize=14, pad=20)
+    fig.tight_layout()
+    return fig, closed, line, fill
+
+def render_radar(traits, scores, title):
+    # scores on 0-10, one per trait
+    with _template(('radar', tuple(traits), title), lambda: _build_radar(traits, title)) as (fig, closed, line, fill):
+        values = np.append(scores, scores[0])
+        line.set_ydata(values)
+        fill.set_xy(np.column_stack([closed, values]))
+        return _save(fig, bbox_inches='tight')
+
+
+# --- Labelled horizontal bars (Hofstede dimensions, top careers) ---
+def _build_hbars(count, figsize, color, title, xlabel):
+    fig, ax = _new_figure(figsize)
+    y_pos = np.arange(count)
+    bars = ax.barh(y_pos, np.zeros(count), align='center', color=color)
+    texts = [ax.text(0, i, "", color='black', va='center') for i in y_pos]
+    ax.set_yticks(y_pos)
+    ax.invert_yaxis()
+    ax.set_xlabel(xlabel)
+    ax.set_title(title)
+    return fig, ax, bars, texts
+
+def render_hofstede(labels, scores):
+    # scores on 0-10; labels are the full dimension names, listed top to bottom
+    def build():
+        fig, ax, bars, texts = _build_hbars(len(labels), (8, 6), BAR_COLOR, "Hofstede's Cultural Dimensions", 'Score')
+        ax.set_yticklabels(labels)
+        ax.set_xlim(0, 10)
+        fig.tight_layout()
+        return fig, bars, texts
+
+    with _template(('hofstede', tuple(labels)), build) as (fig, bars, texts):
+        for i, (bar, text, score) in enumerate(zip(bars, texts, scores)):
+            bar.set_width(score)
+            text.set_position((score + 0.1, i))
+            text.set_text(f"{score:.2f}")
+        return _save(fig)
+
+def render_top_careers(careers, scores):
+    # Best match first; career names change per report, so the layout is redone for the new labels
+    build = lambda: _build_hbars(len(careers), (8, 5), ACCENT_COLOR, "Top Career Recommendations", "Match Score (out of 100)")
+    with _template(('top_careers', len(careers)), build) as (fig, ax, bars, texts):
+        ax.set_yticklabels(careers)
+        for bar, text, score in zip(bars, texts, scores):
+            bar.set_width(score)
+            text.set_position((score, bar.get_y() + bar.get_height() / 2))
+            text.set_text(f"{score:.0f}")
+            text.set_horizontalalignment('left')
+        ax.relim()
+        ax.autoscale_view()
+        fig.tight_layout()
+        return _save(fig, bbox_inches='tight')
@@ -0,0 +1,238 @@
+# gemini_client.py
+# Gemini access shared by the app and command-line tools. This module is imported once
+# per process, so the rate limiter below is shared by every Streamlit session.
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from cache_store import SQLiteCache, make_cache_key
+from lazy_import import lazy_import
+
+# The SDK takes about a second to import, so it is loaded (and configured) on the first request
+genai = lazy_import("google.generativeai")
+
+GEMINI_MAX_IN_FLIGHT = int(os.environ.get("GEMINI_MAX_IN_FLIGHT", 8))
+GEMINI_RPM = float(os.environ.get("GEMINI_RPM", 15))
+# Set GEMINI_CACHE_PATH to an empty string to disable the response cache
+GEMINI_CACHE_PATH = os.environ.get("GEMINI_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "gemini_responses.sqlite3"))
+GEMINI_CACHE_TTL = float(os.environ.get("GEMINI_CACHE_TTL", 7 * 24 * 3600))
+GEMINI_CACHE_MAX_MB = float(os.environ.get("GEMINI_CACHE_MAX_MB", 64))
+
+_model_name = None
+_api_key = None
+_configure_lock = threading.Lock()
+
+
+# --- Rate Limiting ---
+class RateLimiter:
+    # Token bucket: refills at `rate_per_minute`, holds at most one minute's worth of requests
+    def __init__(self, rate_per_minute):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, rate_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        # Stop handing out tokens to every caller, e.g. after the API reports a quota error.
+        # Returns True when this call extended the pause.
+        with self.lock:
+            until = time.monotonic() + seconds
+            if until <= self.paused_until:
+                return False
+            self.paused_until = until
+            self.tokens = 0
+            self.updated = until
+            return True
+
+
+# --- Token Accounting ---
+class TokenMeter:
+    # Process-wide token totals plus a bounded per-call history
+    def __init__(self, history=1000):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.history = deque(maxlen=history)
+
+    def record(self, label, input_tokens, output_tokens):
+        with self.lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.history.append({'time': time.time(), 'label': label, 'input_tokens': input_tokens, 'output_tokens': output_tokens})
+
+    def totals(self):
+        with self.lock:
+            return {'calls': self.calls, 'input_tokens': self.input_tokens, 'output_tokens': self.output_tokens}
+
+
+_limiter = RateLimiter(GEMINI_RPM)
+_token_meter = TokenMeter()
+try:
+    _response_cache = SQLiteCache(GEMINI_CACHE_PATH, GEMINI_CACHE_TTL, int(GEMINI_CACHE_MAX_MB * 1024 * 1024)) if GEMINI_CACHE_PATH else None
+except (OSError, sqlite3.Error) as e:
+    # A cache that cannot be opened (e.g. an unwritable directory) only disables caching
+    print(f"Gemini response cache disabled: could not open {GEMINI_CACHE_PATH}: {e}", file=sys.stderr)
+    _response_cache = None
+
+
+# --- Gemini API ---
+def initialize_gemini():
+    global _model_name, _api_key
+    GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+    if not GEMINI_API_KEY:
+        st.warning("Gemini API Key not found. AI analysis will be disabled.")
+        _model_name = None
+        return None
+    _api_key = GEMINI_API_KEY
+    _model_name = 'gemini-1.5-flash'
+    return _model_name
+
+def _warn(on_warning, message):
+    # Requests usually run in report jobs, outside any Streamlit script run, so problems go to the
+    # caller's on_warning(message) (the job records them for the page); without one, to stderr
+    if on_warning is not None:
+        on_warning(message)
+    else:
+        print(message, file=sys.stderr)
+
+def _configure(on_warning=None):
+    # Configures the SDK with the key from initialize_gemini, once; False if that fails
+    global _model_name, _api_key
+    with _configure_lock:
+        if _api_key is not None:
+            try:
+                genai.configure(api_key=_api_key)
+            except Exception as e:
+                _warn(on_warning, f"Could not configure Gemini API: {e}")
+                _model_name = None
+            _api_key = None
+        return _model_name is not None
+
+def get_gemini_analysis(prompt, client_profile, max_retries=2, generation_config=None, label=None, on_chunk=None, on_warning=None):
+    # client_profile is the context the answer depends on, already projected to the fields the prompt
+    # needs; pass None for prompts that stand on their own. label tags the call in the token history.
+    # With on_chunk, the response is streamed and on_chunk receives the text received so far.
+    # on_warning(message) receives connection and rate-limit problems (see _warn).
+    if not _model_name:
+        return None
+
+    full_prompt = prompt
+    if client_profile:
+        full_prompt = f"{prompt}\n\nHere is the relevant data for context:\n{json.dumps(client_profile, default=str)}"
+
+    cache_key = make_cache_key(_model_name, full_prompt, generation_config)
+    if _response_cache is not None:
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return cached.decode('utf-8')
+    if not _configure(on_warning):
+        return None
+
+    for attempt in range(max_retries):
+        _limiter.acquire()
+        try:
+            model = genai.GenerativeModel(_model_name)
+            response = model.generate_content(full_prompt, generation_config=generation_config, stream=on_chunk is not None)
+            if on_chunk is not None:
+                partial = ""
+                for chunk in response:
+                    partial += chunk.text
+                    on_chunk(partial)
+            usage = getattr(response, 'usage_metadata', None)
+            _token_meter.record(
+                label,
+                getattr(usage, 'prompt_token_count', 0) or 0,
+                getattr(usage, 'candidates_token_count', 0) or 0
+            )
+            text = response.text
+            if _response_cache is not None and text:
+                _response_cache.set(cache_key, text.encode('utf-8'))
+            return text
+        except Exception as e:
+            if "429" in str(e) or "quota" in str(e).lower():
+                if attempt == max_retries - 1:
+                    # No retry follows, so pausing every other caller would gain nothing
+                    break
+                wait_time = 30 * (attempt + 1)  # Progressive backoff, applied to every caller through the limiter
+                if _limiter.pause(wait_time):
+                    _warn(on_warning, f"Rate limit reached. Pausing AI requests for {wait_time} seconds before retry...")
+            else:
+                _warn(on_warning, f"Could not connect to Gemini API (attempt {attempt + 1}): {e}")
+                break
+
+    return None
+
+def get_response_cache_stats():
+    return _response_cache.stats() if _response_cache is not None else None
+
+def get_token_usage():
+    return _token_meter.totals()
+
+def run_gemini_prompts(requests, max_in_flight=None, on_warning=None):
+    # requests is {prompt_id: (prompt, context)}; sends them all concurrently and
+    # returns {prompt_id: text} for the calls that succeeded
+    def call(prompt, context, label):
+        return get_gemini_analysis(prompt, context, label=label, on_warning=on_warning)
+
+    with ThreadPoolExecutor(max_workers=max_in_flight or GEMINI_MAX_IN_FLIGHT) as executor:
+        futures = {
+            prompt_id: executor.submit(call, prompt, context, str(prompt_id))
+            for prompt_id, (prompt, context) in requests.items()
+        }
+        results = {prompt_id: future.result() for prompt_id, future in futures.items()}
+
+    return {prompt_id: text for prompt_id, text in results.items() if text}
+
+def stream_gemini_prompts(requests, max_in_flight=None, on_warning=None):
+    # Like run_gemini_prompts, but yields (prompt_id, text, done) events as output streams in.
+    # text is cumulative; each prompt ends with one done=True event whose text is None on failure.
+    events = queue.Queue()
+
+    def call(prompt_id, prompt, context):
+        text = None
+        try:
+            text = get_gemini_analysis(
+                prompt, context, label=str(prompt_id),
+                on_chunk=lambda partial: events.put((prompt_id, partial, False)),
+                on_warning=on_warning
+            )
+        finally:
+            events.put((prompt_id, text, True))
+
+    with ThreadPoolExecutor(max_workers=max_in_flight or GEMINI_MAX_IN_FLIGHT) as executor:
+        for prompt_id, (prompt, context) in requests.items():
+            executor.submit(call, prompt_id, prompt, context)
+
+        remaining = len(requests)
+        while remaining:
+            event = events.get()
+            if event[2]:
+                remaining -= 1
+            yield event
@@ -0,0 +1,39 @@
+# lazy_import.py
+# Deferred imports for dependencies that are slow to load but only needed once a report is
+# generated (matplotlib, reportlab, the Gemini SDK, gspread, pyarrow). lazy_import checks right away
+# that the module is installed, so a missing library still fails at startup, but only imports it on
+# first attribute access. Check cold-start cost with benchmarks/bench_startup.py.
+import importlib
+import importlib.machinery
+
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        # Only called for attributes not set in __init__; importlib serializes concurrent first imports
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+    def __repr__(self):
+        return f"<lazy module '{self._name}'{' (loaded)' if self._module is not None else ''}>"
+
+
+def _installed(name):
+    # Finds each package on the path in turn, without importing the parents as find_spec would
+    path = None
+    for part in name.split('.'):
+        spec = importlib.machinery.PathFinder.find_spec(part, path)
+        if spec is None:
+            return False
+        path = spec.submodule_search_locations
+    return True
+
+def lazy_import(name):
+    # Raises ImportError (with .name set, like a failed import) when the module is not installed
+    if not _installed(name):
+        raise ImportError(f"No module named '{name}'", name=name)
+    return LazyModule(name)
@@ -0,0 +1,97 @@
+# narrative_library.py
+# Pre-generated development-plan narratives for every (category, trait, score band).
+# Build it offline with:  python narrative_library.py [--output narrative_library.json]
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
+
+from questionnaire import questions, aptitude_questions
+
+# Bump LIBRARY_VERSION whenever DEV_PLAN_PROMPT or the file layout changes; stale libraries are ignored
+LIBRARY_VERSION = 1
+DEV_PLAN_PROMPT = "Based on a {score_cat} score in {trait} ({category}), suggest 2 very brief, one-line development points."
+SCORE_CATEGORIES = ['low', 'medium', 'high']
+LIBRARY_TRAITS = {
+    'Aptitude': list(aptitude_questions),
+    'OCEAN': list(questions['OCEAN']),
+    'RIASEC': list(questions['RIASEC']),
+    'Hofstede': list(questions['Hofstede'])
+}
+NARRATIVE_LIBRARY_PATH = os.environ.get("NARRATIVE_LIBRARY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "narrative_library.json"))
+
+
+def dev_plan_prompt(category, trait, score_cat):
+    return DEV_PLAN_PROMPT.format(category=category, trait=trait, score_cat=score_cat)
+
+@lru_cache(maxsize=8)
+def _read_narrative_library(path, mtime):
+    # mtime is only part of the cache key
+    try:
+        with open(path, encoding='utf-8') as f:
+            library = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if library.get('version') != LIBRARY_VERSION or library.get('prompt') != DEV_PLAN_PROMPT:
+        return {}
+    return library.get('development_plans', {})
+
+def load_narrative_library(path=NARRATIVE_LIBRARY_PATH):
+    # Returns {category: {trait: {score_cat: text}}}, or {} when the library is missing or stale.
+    # Cached per modification time, so a library built or rebuilt while the server runs is picked up.
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    return _read_narrative_library(path, mtime)
+
+def lookup_development_plan(category, trait, score_cat, path=NARRATIVE_LIBRARY_PATH):
+    return load_narrative_library(path).get(category, {}).get(trait, {}).get(score_cat)
+
+def build_narrative_library(path):
+    from gemini_client import initialize_gemini, run_gemini_prompts, get_token_usage
+
+    model_name = initialize_gemini()
+    if not model_name:
+        print("GEMINI_API_KEY is not set; cannot build the narrative library.", file=sys.stderr)
+        return 1
+
+    requests = {
+        (category, trait, score_cat): (dev_plan_prompt(category, trait, score_cat), None)
+        for category, traits in LIBRARY_TRAITS.items()
+        for trait in traits
+        for score_cat in SCORE_CATEGORIES
+    }
+    start = time.perf_counter()
+    responses = run_gemini_prompts(requests)
+
+    development_plans = {}
+    for (category, trait, score_cat), text in responses.items():
+        development_plans.setdefault(category, {}).setdefault(trait, {})[score_cat] = text.strip()
+
+    library = {
+        'version': LIBRARY_VERSION,
+        'prompt': DEV_PLAN_PROMPT,
+        'model': model_name,
+        'generated': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'development_plans': development_plans
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(library, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+    usage = get_token_usage()
+    print(f"Wrote {len(responses)}/{len(requests)} development plans to {path} in {time.perf_counter() - start:.1f}s")
+    print(f"Gemini usage: {usage['calls']} calls, {usage['input_tokens']} input tokens, {usage['output_tokens']} output tokens")
+    return 0 if len(responses) == len(requests) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate the development-plan narrative library.")
+    parser.add_argument("--output", default=NARRATIVE_LIBRARY_PATH, help="Library file to write")
+    args = parser.parse_args()
+    sys.exit(build_narrative_library(args.output))
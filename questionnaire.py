@@ -1,5 +1,4 @@
 # questionnaire.py
-import streamlit as st
 
 questions = {
     'RIASEC': {
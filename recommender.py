@@ -0,0 +1,209 @@
+# recommender.py
+# Career matching. Career profiles are compiled once into stacked NumPy matrices (one block per
+# dimension) so every career is scored against a user, or a whole batch of users, in one pass.
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# Correlations are rounded to this many decimals before ranking and classification
+CORRELATION_DECIMALS = 12
+# Trait scores on every instrument run from 0 to 10
+SCORE_RANGE = 10.0
+SIMILARITIES = ('correlation', 'cosine', 'distance')
+
+
+def parse_dimensions(spec):
+    # "RIASEC:correlation:0.5,Aptitude:distance:0.3" -> {'RIASEC': ('correlation', 0.5), ...}
+    dimensions = {}
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        name, similarity, weight = (field.strip() for field in part.split(':'))
+        if similarity not in SIMILARITIES:
+            raise ValueError(f"Unknown similarity '{similarity}' for {name}; expected one of {SIMILARITIES}")
+        dimensions[name] = (similarity, float(weight))
+    return dimensions
+
+# The default reproduces the original RIASEC-only correlation ranking
+MATCH_DIMENSIONS = parse_dimensions(os.environ.get("MATCH_DIMENSIONS", "RIASEC:correlation:1"))
+# Catalogs at least this large are searched through a ball tree instead of an exact scan
+# (see benchmarks/bench_topk.py; below this size argpartition over all scores is faster)
+CAREER_INDEX_MIN_SIZE = int(os.environ.get("CAREER_INDEX_MIN_SIZE", 50000))
+
+
+@lru_cache(maxsize=None)
+def _ball_tree_class():
+    # scikit-learn takes seconds to import, so it is only loaded once a catalog is big enough to use it
+    try:
+        from sklearn.neighbors import BallTree
+    except ImportError:  # optional: without scikit-learn every catalog uses the exact argpartition search
+        return None
+    return BallTree
+
+
+class CareerMatrix:
+    # Careers are compiled into (dimension, career, trait) arrays, zero-padded to the widest
+    # dimension, with a fixed trait order per dimension:
+    #   correlation: mean-centered, unit-norm rows        -> dot product is Pearson r
+    #   cosine:      unit-norm rows                       -> dot product is cosine similarity
+    #   distance:    rows weighted by the career's own profile (its career_cluster_weights for
+    #                Aptitude), so traits the career relies on count more -> weighted RMS distance
+    def __init__(self, career_clusters, dimensions=None):
+        dimensions = dimensions or MATCH_DIMENSIONS
+        self.dimensions = [(name, similarity, weight) for name, (similarity, weight) in dimensions.items() if weight > 0]
+        if not self.dimensions:
+            raise ValueError("At least one matching dimension needs a positive weight")
+        self.careers = list(career_clusters)
+        first = next(iter(career_clusters.values()))
+        self.traits = {name: list(first[name]) for name, _, _ in self.dimensions}
+
+        width = max(len(traits) for traits in self.traits.values())
+        shape = (len(self.dimensions), len(self.careers), width)
+        self.projection = np.zeros(shape)
+        self.trait_weights = np.zeros(shape)
+        self.target_energy = np.zeros(shape[:2])
+
+        for d, (name, similarity, _) in enumerate(self.dimensions):
+            k = len(self.traits[name])
+            values = np.array([[profile[name][trait] for trait in self.traits[name]] for profile in career_clusters.values()], dtype=np.float64)
+            if similarity == 'distance':
+                totals = values.sum(axis=1, keepdims=True)
+                weights = np.divide(values, totals, out=np.zeros_like(values), where=totals > 0)
+                self.trait_weights[d, :, :k] = weights
+                self.projection[d, :, :k] = weights * values
+                self.target_energy[d] = (weights * values ** 2).sum(axis=1)
+            else:
+                self.projection[d, :, :k] = _unit_rows(values, center=similarity == 'correlation')
+
+        weights = np.array([weight for _, _, weight in self.dimensions])
+        self.dimension_weights = weights / weights.sum()
+        self.kinds = [similarity for _, similarity, _ in self.dimensions]
+        self._tree = None
+
+    def user_tensor(self, client_profiles):
+        # (n_users, dimension, trait), prepared the same way as the career side
+        users = np.zeros((len(client_profiles), len(self.dimensions), self.projection.shape[2]))
+        for d, (name, similarity, _) in enumerate(self.dimensions):
+            k = len(self.traits[name])
+            values = np.array([[profile[name].get(trait, 0) for trait in self.traits[name]] for profile in client_profiles], dtype=np.float64)
+            users[:, d, :k] = values if similarity == 'distance' else _unit_rows(values, center=similarity == 'correlation')
+        return users
+
+    def dimension_scores(self, users, careers=None):
+        # (n_users, dimension, career) similarity mapped onto 0-100, optionally for a subset of careers
+        projection = self.projection if careers is None else self.projection[:, careers]
+        trait_weights = self.trait_weights if careers is None else self.trait_weights[:, careers]
+        target_energy = self.target_energy if careers is None else self.target_energy[:, careers]
+
+        cross = np.einsum('ndk,djk->ndj', users, projection)
+        scores = np.empty_like(cross)
+        for d, similarity in enumerate(self.kinds):
+            if similarity == 'correlation':
+                scores[:, d] = (np.round(cross[:, d], CORRELATION_DECIMALS) + 1) * 50
+            elif similarity == 'cosine':
+                scores[:, d] = np.round(cross[:, d], CORRELATION_DECIMALS) * 100
+            else:
+                user_energy = np.einsum('nk,jk->nj', users[:, d] ** 2, trait_weights[d])
+                distance = np.sqrt(np.maximum(user_energy - 2 * cross[:, d] + target_energy[d], 0))
+                scores[:, d] = np.maximum(1 - distance / SCORE_RANGE, 0) * 100
+        return scores
+
+    def composite_scores(self, users, careers=None):
+        return np.round(np.einsum('ndj,d->nj', self.dimension_scores(users, careers), self.dimension_weights), CORRELATION_DECIMALS - 2)
+
+    def scores(self, client_profiles):
+        # (n_users, career) weighted composite score on 0-100
+        return self.composite_scores(self.user_tensor(client_profiles))
+
+    def top_k(self, client_profiles, k):
+        # [(career_indices, scores)] per user, best first, ties in catalog order
+        users = self.user_tensor(client_profiles)
+        k = min(k, len(self.careers))
+        if self._uses_index():
+            _, candidates = self._get_tree().query(self._query_points(users), k=k)
+            results = []
+            for user, careers in zip(users, candidates):
+                careers = np.sort(careers)
+                scores = self.composite_scores(user[None], careers)[0]
+                order = np.argsort(-scores, kind='stable')
+                results.append((careers[order], scores[order]))
+            return results
+
+        results = []
+        for scores in self.composite_scores(users):
+            if k < len(scores):
+                # Keep everything tied with the k-th best so the cut matches a full stable sort
+                kth = -np.partition(-scores, k - 1)[k - 1]
+                careers = np.flatnonzero(scores >= kth)
+            else:
+                careers = np.arange(len(scores))
+            order = np.argsort(-scores[careers], kind='stable')[:k]
+            results.append((careers[order], scores[careers][order]))
+        return results
+
+    # --- Nearest-neighbour index ---
+    # With only correlation and cosine dimensions, the composite score is an affine function of one
+    # inner product between concatenated weighted user blocks and concatenated unit career blocks.
+    # Padding every career point to a common norm turns that maximum-inner-product search into a
+    # Euclidean nearest-neighbour query, which a ball tree answers without scanning the catalog.
+    def _uses_index(self):
+        return len(self.careers) >= CAREER_INDEX_MIN_SIZE and 'distance' not in self.kinds and _ball_tree_class() is not None
+
+    def _get_tree(self):
+        if self._tree is None:
+            points = self.projection.transpose(1, 0, 2).reshape(len(self.careers), -1)
+            norms = (points ** 2).sum(axis=1)
+            padding = np.sqrt(np.maximum(norms.max() - norms, 0))
+            self._tree = _ball_tree_class()(np.hstack([points, padding[:, None]]))
+        return self._tree
+
+    def _query_points(self, users):
+        scale = np.array([weight * (50 if kind == 'correlation' else 100) for weight, kind in zip(self.dimension_weights, self.kinds)])
+        queries = (users * scale[None, :, None]).reshape(len(users), -1)
+        return np.hstack([queries, np.zeros((len(users), 1))])
+
+
+def _unit_rows(values, center):
+    if center:
+        values = values - values.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(values, axis=1, keepdims=True)
+    # Rows with no variance (or all zeros) stay zero, which scores as "no similarity"
+    return np.divide(values, norms, out=np.zeros_like(values), where=norms > 0)
+
+
+_compiled = {}
+
+def get_career_matrix(career_clusters, dimensions=None):
+    # Compiled once per catalog object and dimension config, then reused for every request
+    dimensions = dimensions or MATCH_DIMENSIONS
+    key = (id(career_clusters), tuple(dimensions.items()))
+    cached = _compiled.get(key)
+    if cached is None or cached[0] is not career_clusters:
+        cached = (career_clusters, CareerMatrix(career_clusters, dimensions))
+        _compiled[key] = cached
+    return cached[1]
+
+def get_match_level(score):
+    # Thresholds on the 0-100 scale; for a correlation they are r >= 0.7, r >= 0.5 and r > 0
+    return (
+        "Best Fit" if score >= 85 else
+        "Great Fit" if score >= 75 else
+        "Good Fit" if score > 50 else
+        "Not a Strong Match"
+    )
+
+def _rank(matrix, careers, scores):
+    return [
+        (matrix.careers[j], float(score), get_match_level(score))
+        for j, score in zip(careers, scores) if np.isfinite(score)
+    ]
+
+def recommend_careers_batch(client_profiles, career_clusters, dimensions=None, top_n=None):
+    # top_n limits each result to the best N careers; None returns the full ranking
+    matrix = get_career_matrix(career_clusters, dimensions)
+    top = matrix.top_k(client_profiles, top_n or len(matrix.careers))
+    return [_rank(matrix, careers, scores) for careers, scores in top]
+
+def recommend_careers(client_profile, career_clusters, dimensions=None, top_n=None):
+    return recommend_careers_batch([client_profile], career_clusters, dimensions, top_n)[0]
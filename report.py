@@ -0,0 +1,435 @@
+# report.py
+# PDF report layout: charts and the section builders that assemble the per-user story around the
+# build-once content in report_templates. Takes plain data (client profile, recommendations,
+# narratives) and involves no Streamlit, so it can also run in worker processes (see REPORT_WORKERS).
+import multiprocessing
+import os
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+
+import numpy as np
+from PIL import Image as PILImage
+from reportlab import rl_config
+from reportlab.platypus import Paragraph, Spacer, Table, Image, PageBreak, ListFlowable
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.graphics.shapes import Drawing, Circle, Line, Polygon, PolyLine, String
+from reportlab.graphics.charts.barcharts import VerticalBarChart, HorizontalBarChart
+from reportlab.graphics.charts.textlabels import Label
+
+import chart_renderer
+from chart_cache import cached_chart
+from report_content import get_score_category, fallback_content, TOP_RECOMMENDATIONS, CATEGORY_TITLES, TRAIT_FULL_NAMES
+from report_templates import (
+    STYLES, TOC_ENTRIES, TOC_TABLE_STYLE, PROFILE_TABLE_STYLE, SWOT_TABLE_STYLE, static, create_score_bar, create_doc,
+    apple_blue, apple_green
+)
+from questionnaire import career_descriptions
+from scoring import SECTION_TRAITS
+
+# "matplotlib" embeds 300-dpi PNG charts; "vector" draws them natively with reportlab.graphics
+CHART_BACKEND = os.environ.get("CHART_BACKEND", "matplotlib")
+# Worker processes for chart rendering and PDF layout; 0 keeps the work in the calling process
+REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", 0))
+# Chart images: "full" embeds them as rendered at 300 dpi; "lossless" resamples each one to
+# REPORT_IMAGE_DPI at the size it is displayed; "lossy" also stores an image as JPEG where that is
+# much smaller (the radar charts' antialiased fills), keeping flat-colour bar charts lossless
+SIZE_MODES = ("full", "lossless", "lossy")
+REPORT_SIZE_MODE = os.environ.get("REPORT_SIZE_MODE", "full")
+REPORT_IMAGE_DPI = int(os.environ.get("REPORT_IMAGE_DPI", 150))
+JPEG_QUALITY = 85
+# In "lossy" mode an image becomes a JPEG only below this fraction of its lossless size
+LOSSY_MAX_RATIO = 0.6
+
+# Chart sizes on the page
+CHART_SIZE = (6*inch, 4*inch)
+TOP_CAREERS_CHART_SIZE = (7*inch, 5*inch)
+
+# Page and image streams are Flate-compressed (rl_config.pageCompression); store them as binary
+# rather than ASCII85 text, which every PDF reader accepts and which makes them a quarter smaller.
+# ReportLab only has a global switch for this, so it is set while reports are being built and
+# restored after the last one finishes (see _stream_encoding).
+PDF_ASCII85 = False
+_encoding_lock = threading.Lock()
+_encoding_builds = 0
+_encoding_saved = None
+
+def check_size_mode(size_mode):
+    if size_mode not in SIZE_MODES:
+        raise ValueError(f"Unknown report size mode '{size_mode}'; expected one of {', '.join(SIZE_MODES)}")
+    return size_mode
+
+check_size_mode(REPORT_SIZE_MODE)
+
+@contextmanager
+def _stream_encoding():
+    # Applies PDF_ASCII85 to ReportLab's global setting for the length of a build; concurrent builds
+    # share it, and the last one to finish puts back whatever was set before
+    global _encoding_builds, _encoding_saved
+    with _encoding_lock:
+        if _encoding_builds == 0:
+            _encoding_saved = rl_config.useA85
+        _encoding_builds += 1
+        rl_config.useA85 = int(PDF_ASCII85)
+    try:
+        yield
+    finally:
+        with _encoding_lock:
+            _encoding_builds -= 1
+            if _encoding_builds == 0:
+                rl_config.useA85 = _encoding_saved
+
+# --- Graphing Functions ---
+# Each chart is rendered once per distinct input by chart_renderer and then served from chart_cache
+def create_aptitude_graph(aptitude_data):
+    return cached_chart('aptitude', list(aptitude_data.items()), lambda: _render_aptitude_graph(aptitude_data))
+
+def create_combined_trait_graph(trait_data, trait_category):
+    return cached_chart('trait', [trait_category, list(trait_data.items())], lambda: _render_combined_trait_graph(trait_data, trait_category))
+
+def create_hofstede_graph(hofstede_data):
+    return cached_chart('hofstede', list(hofstede_data.items()), lambda: _render_hofstede_graph(hofstede_data))
+
+def create_top_10_graph(career_recommendations):
+    return cached_chart('top_careers', [[career, score] for career, score, _ in career_recommendations], lambda: _render_top_10_graph(career_recommendations))
+
+def _render_aptitude_graph(aptitude_data):
+    return chart_renderer.render_aptitude(list(aptitude_data.keys()), [s * 10 for s in aptitude_data.values()])
+
+def _render_combined_trait_graph(trait_data, trait_category):
+    return chart_renderer.render_radar(list(trait_data.keys()), list(trait_data.values()), f"{trait_category} Profile")
+
+def _render_hofstede_graph(hofstede_data):
+    return chart_renderer.render_hofstede([TRAIT_FULL_NAMES.get(d, d) for d in hofstede_data], list(hofstede_data.values()))
+
+def _render_top_10_graph(career_recommendations):
+    careers, scores, _ = zip(*career_recommendations)
+    return chart_renderer.render_top_careers(list(careers), list(scores))
+
+# --- Vector Charts ---
+# reportlab.graphics counterparts of the matplotlib charts above, used when CHART_BACKEND is "vector"
+def draw_aptitude_chart(aptitude_data, width, height):
+    drawing = Drawing(width, height)
+    chart = VerticalBarChart()
+    chart.x, chart.y = 0.7*inch, 0.6*inch
+    chart.width, chart.height = width - 0.9*inch, height - 1.1*inch
+    chart.data = [[s * 10 for s in aptitude_data.values()]]
+    chart.categoryAxis.categoryNames = list(aptitude_data.keys())
+    chart.categoryAxis.labels.angle = 45
+    chart.categoryAxis.labels.boxAnchor = 'ne'
+    chart.valueAxis.valueMin, chart.valueAxis.valueMax, chart.valueAxis.valueStep = 0, 100, 20
+    chart.bars[0].fillColor = apple_blue
+    chart.bars[0].strokeColor = None
+    drawing.add(chart)
+    drawing.add(String(width / 2, height - 0.3*inch, "Aptitude Profile", fontName='Helvetica', fontSize=12, textAnchor='middle'))
+    drawing.add(Label(x=0.25*inch, y=chart.y + chart.height / 2, angle=90, text="Score (%)", fontName='Helvetica', fontSize=9))
+    return drawing
+
+def draw_radar_chart(trait_data, trait_category, width, height):
+    drawing = Drawing(width, height)
+    traits = list(trait_data.keys())
+    cx, cy = width / 2, (height - 0.5*inch) / 2
+    radius = min(width, height - 0.5*inch) * 0.36
+    # Same layout as the polar plot: first trait due east, counterclockwise, 0-10 radially
+    angles = np.linspace(0, 2*np.pi, len(traits), endpoint=False)
+    
+    for ring in (2, 4, 6, 8, 10):
+        drawing.add(Circle(cx, cy, radius * ring / 10, fillColor=None, strokeColor=colors.lightgrey, strokeWidth=0.5))
+    for angle, trait in zip(angles, traits):
+        x, y = np.cos(angle), np.sin(angle)
+        drawing.add(Line(cx, cy, cx + radius * x, cy + radius * y, strokeColor=colors.lightgrey, strokeWidth=0.5))
+        anchor = 'start' if x > 0.1 else 'end' if x < -0.1 else 'middle'
+        drawing.add(String(cx + radius * 1.1 * x, cy + radius * 1.1 * y - 3, trait, fontName='Helvetica', fontSize=8, textAnchor=anchor))
+    
+    points = []
+    for angle, score in zip(angles, trait_data.values()):
+        points += [cx + radius * score / 10 * np.cos(angle), cy + radius * score / 10 * np.sin(angle)]
+    fill = colors.Color(apple_green.red, apple_green.green, apple_green.blue, alpha=0.25)
+    drawing.add(Polygon(points, fillColor=fill, strokeColor=None))
+    drawing.add(PolyLine(points + points[:2], strokeColor=apple_green, strokeWidth=2))
+    for x, y in zip(points[::2], points[1::2]):
+        drawing.add(Circle(x, y, 2.5, fillColor=apple_green, strokeColor=None))
+    
+    drawing.add(String(width / 2, height - 0.3*inch, f"{trait_category} Profile", fontName='Helvetica-Bold', fontSize=14, textAnchor='middle'))
+    return drawing
+
+def _draw_horizontal_bars(labels, scores, width, height, title, value_max, label_format, label_width, xlabel=None, font_size=9):
+    # First label on top, as in the matplotlib charts
+    drawing = Drawing(width, height)
+    chart = HorizontalBarChart()
+    chart.x, chart.y = label_width, 0.6*inch if xlabel else 0.4*inch
+    chart.width, chart.height = width - label_width - 0.4*inch, height - chart.y - 0.5*inch
+    chart.data = [list(scores)[::-1]]
+    chart.categoryAxis.categoryNames = list(labels)[::-1]
+    chart.categoryAxis.labels.fontSize = font_size
+    chart.valueAxis.valueMin, chart.valueAxis.valueMax = 0, value_max
+    chart.barLabelFormat = label_format
+    chart.barLabels.boxAnchor = 'w'
+    chart.barLabels.dx = 3
+    chart.barLabels.fontSize = font_size
+    drawing.add(chart)
+    drawing.add(String(width / 2, height - 0.3*inch, title, fontName='Helvetica', fontSize=12, textAnchor='middle'))
+    if xlabel:
+        drawing.add(String(chart.x + chart.width / 2, 0.15*inch, xlabel, fontName='Helvetica', fontSize=9, textAnchor='middle'))
+    return drawing, chart
+
+def draw_hofstede_chart(hofstede_data, width, height):
+    labels = [TRAIT_FULL_NAMES.get(d, d) for d in hofstede_data]
+    drawing, chart = _draw_horizontal_bars(labels, hofstede_data.values(), width, height, "Hofstede's Cultural Dimensions", 10, '%.2f', 2.1*inch, xlabel='Score', font_size=8)
+    chart.bars[0].fillColor = apple_blue
+    chart.bars[0].strokeColor = None
+    return drawing
+
+def draw_top_careers_chart(career_recommendations, width, height):
+    careers, scores, _ = zip(*career_recommendations)
+    drawing, chart = _draw_horizontal_bars(careers, scores, width, height, "Top Career Recommendations", 100, '%.0f', 2.9*inch, xlabel="Match Score (out of 100)", font_size=7)
+    chart.bars[0].fillColor = apple_green
+    chart.bars[0].strokeColor = None
+    return drawing
+
+def create_chart(kind, data, width, height, png=None):
+    # A report flowable for 'Aptitude', 'Hofstede', 'OCEAN'/'RIASEC' (radar) or 'top_careers' in the configured backend;
+    # png is the chart already rendered by render_charts, if any
+    if CHART_BACKEND == "vector":
+        if kind == 'Aptitude':
+            chart = draw_aptitude_chart(data, width, height)
+        elif kind == 'Hofstede':
+            chart = draw_hofstede_chart(data, width, height)
+        elif kind == 'top_careers':
+            chart = draw_top_careers_chart(data, width, height)
+        else:
+            chart = draw_radar_chart(data, kind, width, height)
+        chart.hAlign = 'CENTER'
+        return chart
+    
+    graph = BytesIO(png) if png is not None else render_chart_png(kind, data)
+    return Image(graph, width=width, height=height, hAlign='CENTER')
+
+def chart_size(kind):
+    return TOP_CAREERS_CHART_SIZE if kind == 'top_careers' else CHART_SIZE
+
+def render_chart_png(kind, data, size_mode=None):
+    # The chart image to embed: as rendered in "full" mode, otherwise resampled (and maybe JPEG)
+    size_mode = check_size_mode(size_mode or REPORT_SIZE_MODE)
+    if size_mode == "full":
+        return _render_full_chart_png(kind, data)
+    return cached_chart(
+        f"{kind}/{size_mode}", [REPORT_IMAGE_DPI, JPEG_QUALITY, LOSSY_MAX_RATIO, data],
+        lambda: compress_chart_image(_render_full_chart_png(kind, data).getvalue(), *chart_size(kind), size_mode)
+    )
+
+def _render_full_chart_png(kind, data):
+    if kind == 'Aptitude':
+        return create_aptitude_graph(data)
+    if kind == 'Hofstede':
+        return create_hofstede_graph(data)
+    if kind == 'top_careers':
+        return create_top_10_graph(data)
+    return create_combined_trait_graph(data, kind)
+
+def compress_chart_image(png, width, height, size_mode):
+    # Resamples a rendered chart to REPORT_IMAGE_DPI at its displayed width x height (in points),
+    # never upsampling. The result is a PNG, or in "lossy" mode a JPEG if that is small enough.
+    image = PILImage.open(BytesIO(png)).convert('RGB')
+    size = (min(image.width, round(width / inch * REPORT_IMAGE_DPI)), min(image.height, round(height / inch * REPORT_IMAGE_DPI)))
+    if size != image.size:
+        image = image.resize(size, PILImage.LANCZOS)
+    
+    buffer = BytesIO()
+    image.save(buffer, format='PNG')
+    if size_mode == "lossy":
+        jpeg = BytesIO()
+        image.save(jpeg, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+        # ReportLab embeds PNGs as Flate-compressed RGB and JPEGs as they are, so compare those
+        if jpeg.tell() < LOSSY_MAX_RATIO * len(zlib.compress(image.tobytes())):
+            buffer = jpeg
+    buffer.seek(0)
+    return buffer
+
+def render_charts(client_profile, career_recommendations, size_mode=None):
+    # {kind: image bytes} for every chart in the report, so they can be rendered ahead of (and alongside)
+    # the rest of the report; vector charts are drawn during layout, so there is nothing to do for them
+    if CHART_BACKEND == "vector":
+        return {}
+    charts = {category: render_chart_png(category, client_profile[category], size_mode).getvalue() for category in SECTION_TRAITS}
+    if career_recommendations:
+        charts['top_careers'] = render_chart_png('top_careers', career_recommendations[:TOP_RECOMMENDATIONS], size_mode).getvalue()
+    return charts
+
+# --- PDF Builder Functions ---
+def _build_cover_page(story, client_profile, styles):
+    story.append(Spacer(1, 2*inch))
+    story.append(static('title'))
+    story.append(Spacer(1, 0.2*inch))
+    story.append(Paragraph(f"Prepared for {client_profile['name']}", styles['AppleH2']))
+    story.append(Spacer(1, 0.1*inch))
+    story.append(Paragraph(f"Date: {client_profile['date']}", styles['AppleBody']))
+    story.append(PageBreak())
+
+def _build_table_of_contents(story, styles):
+    story.append(static('h1', "Table of Contents"))
+    
+    toc_table = Table([(entry,) for entry in TOC_ENTRIES], colWidths=[6.5*inch], hAlign='LEFT')
+    toc_table.setStyle(TOC_TABLE_STYLE)
+    
+    story.append(toc_table)
+    story.append(PageBreak())
+
+def _build_personal_profile_section(story, client_profile, styles):
+    story.append(static('h1', "Personal Profile"))
+    
+    profile_data = [
+        ["Name:", client_profile['name']],
+        ["Age:", str(client_profile['age'])],
+        ["Email:", client_profile['email']],
+        ["Phone:", client_profile['phone']],
+        ["Status:", client_profile['status']]
+    ]
+    
+    profile_table = Table(profile_data, colWidths=[1.5*inch, 4.5*inch], hAlign='LEFT')
+    profile_table.setStyle(PROFILE_TABLE_STYLE)
+    
+    story.append(profile_table)
+    story.append(Spacer(1, 0.5*inch))
+    story.append(PageBreak())
+
+def _build_trait_analysis_section(story, client_profile, styles, category, traits, narratives, charts):
+    story.append(static('h1', f"{CATEGORY_TITLES[category]} Analysis"))
+    
+    story.append(create_chart(category, client_profile[category], *CHART_SIZE, png=charts.get(category)))
+    
+    story.append(Spacer(1, 0.2*inch))
+    
+    for trait in traits:
+        score = client_profile.get(category, {}).get(trait, 0)
+        score_cat = get_score_category(score)
+        
+        story.append(static('trait_heading', trait))
+        story.append(create_score_bar(score))
+        story.append(Spacer(1, 0.1*inch))
+        
+        story.append(static('meaning', category, trait))
+        story.append(static('analysis', category, trait, score_cat))
+        
+        dev_plan = narratives.get(f"dev_{category}_{trait}") or fallback_content["development_plan"]
+        
+        story.append(static('dev_plan_label'))
+        dev_points = [p.strip() for p in dev_plan.split("\n") if p.strip()]
+        if dev_points:
+            story.append(ListFlowable([Paragraph(p, styles['AppleList']) for p in dev_points], bulletType='bullet'))
+        
+        story.append(Spacer(1, 0.4*inch))
+    
+    story.append(PageBreak())
+
+def _build_recommendations_section(story, career_recommendations, styles, charts):
+    story.append(static('h1', "Top Career Recommendations"))
+    story.append(Spacer(1, 0.2*inch))
+    
+    if career_recommendations:
+        story.append(create_chart('top_careers', career_recommendations[:TOP_RECOMMENDATIONS], *TOP_CAREERS_CHART_SIZE, png=charts.get('top_careers')))
+    
+    story.append(PageBreak())
+
+def _build_detailed_analysis_section(story, career_recommendations, narratives, styles):
+    story.append(static('h1', "Detailed Career Analysis"))
+    story.append(Spacer(1, 0.2*inch))
+    
+    for i, (career, score, match) in enumerate(career_recommendations[:3], 1):
+        story.append(Paragraph(f"{i}. {career}", styles['AppleH2_Boxed']))
+        story.append(Paragraph(f"Overall Match Score: {score:.0f}", styles['AppleSubtitle']))
+        story.append(Spacer(1, 0.1*inch))
+        
+        story.append(static('career_description', career if career in career_descriptions else None))
+        story.append(Spacer(1, 0.3*inch))
+        
+        # SWOT Analysis
+        swot_data = []
+        for key in fallback_content["swot"]:
+            response = narratives.get(f"swot_{i}_{key}") or fallback_content["swot"][key]
+            swot_data.append([
+                static('swot_key', key),
+                Paragraph(response, styles['AppleBody'])
+            ])
+        
+        swot_table = Table(swot_data, colWidths=[0.5*inch, 5.7*inch], hAlign='LEFT')
+        swot_table.setStyle(SWOT_TABLE_STYLE)
+        
+        story.append(swot_table)
+        story.append(Spacer(1, 0.5*inch))
+        story.append(PageBreak())
+
+def _build_conclusion(story, narratives, styles):
+    story.append(static('h1', "Conclusion"))
+    story.append(Spacer(1, 0.2*inch))
+    
+    conclusion = narratives.get("conclusion") or fallback_content["conclusion"]
+    story.append(Paragraph(conclusion, styles['AppleBody']))
+
+def generate_pdf_report(client_profile, career_recommendations, narratives, charts=None, size_mode=None):
+    # narratives is {narrative_id: text}, already generated; see app.generate_report_narratives.
+    # charts is the optional output of render_charts for the same size_mode (default REPORT_SIZE_MODE);
+    # otherwise the charts are rendered here. Identical images are embedded once per document.
+    size_mode = check_size_mode(size_mode or REPORT_SIZE_MODE)
+    charts = charts or render_charts(client_profile, career_recommendations, size_mode)
+    buffer = BytesIO()
+    doc = create_doc(buffer)
+    doc.client_name = client_profile['name']
+    styles = STYLES
+    
+    story = []
+    
+    # Build all sections
+    _build_cover_page(story, client_profile, styles)
+    _build_table_of_contents(story, styles)
+    _build_personal_profile_section(story, client_profile, styles)
+    
+    for category, traits in SECTION_TRAITS.items():
+        _build_trait_analysis_section(story, client_profile, styles, category, traits, narratives, charts)
+    
+    _build_recommendations_section(story, career_recommendations, styles, charts)
+    _build_detailed_analysis_section(story, career_recommendations, narratives, styles)
+    _build_conclusion(story, narratives, styles)
+    
+    with _stream_encoding():
+        doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+# --- Report Worker Pool ---
+_pool = None
+_pool_lock = threading.Lock()
+
+def render_report_pdf(client_profile, career_recommendations, narratives, charts=None):
+    # Plain data in, PDF bytes out: the unit of work sent to a report worker
+    return generate_pdf_report(client_profile, career_recommendations, narratives, charts).getvalue()
+
+def _worker_ready():
+    return os.getpid()
+
+def get_report_pool():
+    # One warm pool per server process. "spawn" keeps workers clear of the server's threads and
+    # sockets; they are started up front so the first report does not pay for process start-up.
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=REPORT_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+            for future in [_pool.submit(_worker_ready) for _ in range(REPORT_WORKERS)]:
+                future.result()
+        return _pool
+
+def build_charts(client_profile, career_recommendations):
+    # Returns render_charts' images, rendered in a worker process when REPORT_WORKERS is set
+    if REPORT_WORKERS <= 0 or CHART_BACKEND == "vector":
+        return render_charts(client_profile, career_recommendations)
+    return get_report_pool().submit(render_charts, client_profile, career_recommendations).result()
+
+def build_report(client_profile, career_recommendations, narratives, charts=None):
+    # Returns the PDF as a BytesIO, laid out in a worker process when REPORT_WORKERS is set
+    if REPORT_WORKERS <= 0:
+        return generate_pdf_report(client_profile, career_recommendations, narratives, charts)
+    pdf = get_report_pool().submit(render_report_pdf, client_profile, career_recommendations, narratives, charts).result()
+    return BytesIO(pdf)
@@ -0,0 +1,66 @@
+# report_content.py
+# The report's fixed text: trait definitions and analyses, fallback narratives, display names and
+# score bands. Plain data with no PDF dependencies, so the questionnaire pages can use it without
+# loading the report toolkit (see report_templates for the layout side).
+
+# --- Hardcoded Trait Definitions ---
+trait_definitions = {
+    'Aptitude': {
+        'V': { 'meaning': "Verbal Aptitude (V) measures the ability to understand and reason with language, including reading comprehension and vocabulary.", 'analysis': { 'low': "A lower score suggests a preference for hands-on, numerical, or visual tasks over language-heavy ones.", 'medium': "A moderate score indicates a solid, functional grasp of language.", 'high': "A high score indicates a strong talent for language, suiting roles in writing, law, or education." }},
+        'Nu': { 'meaning': "Numerical Aptitude (Nu) assesses the ability to work with numbers and solve mathematical problems quickly and accurately.", 'analysis': { 'low': "A lower score indicates a preference for qualitative, creative, or interpersonal work over tasks that are heavily reliant on numbers.", 'medium': "A moderate score shows you are competent with day-to-day numerical tasks like budgeting or metrics.", 'high': "A high score signals a strong ability in mathematics and data interpretation, ideal for finance, data science, or engineering." }},
+        'Sp': { 'meaning': "Spatial Aptitude (Sp) evaluates the capacity to visualize and manipulate objects in two and three-dimensional space.", 'analysis': { 'low': "A lower score suggests a preference for abstract or verbal tasks rather than those requiring mental visualization of objects.", 'medium': "A moderate score indicates a functional ability to understand and work with diagrams, maps, and physical spaces.", 'high': "A high score is a key indicator for success in fields like engineering, architecture, design, and surgery." }},
+        'LR': { 'meaning': "Logical Reasoning (LR) measures the ability to analyze information, identify patterns, and draw valid conclusions.", 'analysis': { 'low': "A lower score may indicate a more intuitive or creative approach to problem-solving, rather than a step-by-step, formal logic process.", 'medium': "A moderate score shows a solid ability to solve problems logically and make well-reasoned decisions.", 'high': "A high score demonstrates excellent problem-solving and critical thinking skills, perfect for strategy, law, and research roles." }},
+        'Me': { 'meaning': "Mechanical Aptitude (Me) assesses understanding of basic mechanical principles and physical laws.", 'analysis': { 'low': "A lower score suggests strengths lie outside of hands-on mechanical fields, perhaps in work involving data, people, or ideas.", 'medium': "A moderate score indicates a good foundational understanding of how things work, suiting many technical roles.", 'high': "A high score indicates a natural talent for understanding machinery and physical systems, a strong asset for engineering or skilled trades." }},
+        'Pe': { 'meaning': "Perceptual Aptitude (Pe) measures the ability to quickly and accurately identify visual patterns, details, and differences.", 'analysis': { 'low': "A lower score suggests your strengths are in areas other than rapid visual processing, preferring tasks that allow for deeper analysis.", 'medium': "A moderate score shows a good eye for detail, making you reliable in tasks that require quality control or data checking.", 'high': "A high score indicates a keen ability to spot errors and inconsistencies quickly, valuable in quality assurance, editing, and data verification." }},
+        'Ab': { 'meaning': "Abstract Reasoning (Ab) evaluates the ability to identify patterns and relationships in non-verbal, abstract information.", 'analysis': { 'low': "A lower score may indicate a preference for concrete, practical problem solving over dealing with theoretical and abstract concepts.", 'medium': "A moderate score shows a good capacity for conceptual thinking and adapting to unfamiliar problems.", 'high': "A high score signals a strong ability to think conceptually and strategically, key for complex fields like IT, science, and strategy." }}
+    },
+    'OCEAN': {
+        'Openness': { 'meaning': "Reflects willingness to embrace new ideas, art, and experiences.", 'analysis': { 'low': "You are practical, conventional, and prefer familiar routines and proven approaches.", 'medium': "You balance appreciating new ideas with valuing tradition and practical reality.", 'high': "You are imaginative, curious, and open-minded, thriving in creative and dynamic environments." } },
+        'Conscientiousness': { 'meaning': "About being organized, responsible, and hardworking.", 'analysis': { 'low': "You are more spontaneous and flexible, preferring to go with the flow rather than stick to a rigid plan.", 'medium': "You are generally reliable and organized, but can also be flexible when needed.", 'high': "You show exceptional discipline, organization, and a strong sense of duty. You are highly reliable and driven." } },
+        'Extraversion': { 'meaning': "The tendency to seek stimulation from social interactions.", 'analysis': { 'low': "You are more reserved and thoughtful (introverted), energized by spending time alone.", 'medium': "You enjoy a mix of social time and solitude (ambiverted), adapting to the situation.", 'high': "You are outgoing and sociable, energized by being around others and thriving in team environments." } },
+        'Agreeableness': { 'meaning': "The tendency to be compassionate and cooperative.", 'analysis': { 'low': "You are more competitive and analytical, prioritizing logic over emotion in decisions.", 'medium': "You are cooperative but can also assert your own interests when necessary.", 'high': "You are empathetic, cooperative, and a great team player, skilled at building harmony." } },
+        'Neuroticism': { 'meaning': "The tendency to experience negative emotions like anxiety and stress.", 'analysis': { 'low': "You are calm, resilient, and secure (high emotional stability), handling stress well.", 'medium': "You experience a normal range of emotions, generally stable but can feel stress in difficult situations.", 'high': "You are sensitive to stress and prone to worry, experiencing emotions intensely." } }
+    },
+    'RIASEC': {
+        'Realistic': { 'meaning': "Prefers working with objects, tools, and machines.", 'analysis': { 'low': "You prefer working with people, ideas, or data rather than hands-on, physical tasks.", 'medium': "You are comfortable in both practical, hands-on situations and more abstract or people-oriented work.", 'high': "You have a strong interest in physical, hands-on work. Careers in trades, engineering, and outdoors are a great fit." } },
+        'Investigative': { 'meaning': "Enjoys analyzing, researching, and solving complex problems.", 'analysis': { 'low': "You prefer practical action or social interaction over deep analytical and research-oriented tasks.", 'medium': "You have a healthy curiosity and enjoy solving problems, but also value practical application.", 'high': "You have a deep curiosity and a passion for analysis. Careers in science, research, and data are a strong match." } },
+        'Artistic': { 'meaning': "Creative, intuitive, and expressive, preferring unstructured situations.", 'analysis': { 'low': "You prefer structure, logic, and clear outcomes over ambiguity and self-expression.", 'medium': "You appreciate creativity and can bring an innovative spark to more structured roles.", 'high': "You have a strong need for self-expression and creativity, thriving in fields like design, writing, and arts." } },
+        'Social': { 'meaning': "Enjoys working with people; helpful, friendly, and trustworthy.", 'analysis': { 'low': "You prefer working with data, things, or ideas rather than directly helping or instructing people.", 'medium': "You are a good team player but may not want a role that is exclusively focused on helping others.", 'high': "You have a strong desire to help, teach, and connect with others, suiting roles in counseling, healthcare, and education." } },
+        'Enterprising': { 'meaning': "Energetic, ambitious, and sociable; enjoys leading and persuading.", 'analysis': { 'low': "You prefer supportive, analytical, or creative roles over those involving leadership or sales.", 'medium': "You are comfortable taking initiative but are not necessarily driven to be in charge at all times.", 'high': "You are a natural leader and persuader, making you a great fit for business, sales, and management." } },
+        'Conventional': { 'meaning': "Prefers structured environments with clear rules; detail-oriented.", 'analysis': { 'low': "You have a strong dislike for routine and detailed procedural work, preferring creative or unstructured environments.", 'medium': "You are comfortable with detail-oriented work but also appreciate having some variety and flexibility.", 'high': "You are highly organized, efficient, and reliable, excelling in roles that require structure and data management." } }
+    },
+    'Hofstede': {
+        'PDI': { 'meaning': "Power Distance Index: How a society handles inequalities.", 'analysis': { 'low': "You prefer a flat structure, open communication, and equal distribution of power.", 'medium': "You are adaptable to both hierarchical and egalitarian work environments.", 'high': "You are comfortable with clear hierarchies and respect for authority." } },
+        'IDV': { 'meaning': "Individualism vs. Collectivism: Degree of interdependence.", 'analysis': { 'low': "You prioritize group harmony and team success over individual recognition (Collectivist).", 'medium': "You value both personal achievement and group collaboration.", 'high': "You are self-reliant and value personal achievement and autonomy (Individualist)." } },
+        'MAS': { 'meaning': "Masculinity vs. Femininity: Assertiveness vs. cooperation.", 'analysis': { 'low': "You value work-life balance, cooperation, and a supportive environment (Feminine).", 'medium': "You are driven to succeed but also highly value a positive work environment.", 'high': "You are highly ambitious, competitive, and motivated by success (Masculine)." } },
+        'UAI': { 'meaning': "Uncertainty Avoidance Index: Comfort with ambiguity.", 'analysis': { 'low': "You are comfortable with ambiguity, adaptable to change, and open to taking risks.", 'medium': "You can tolerate uncertainty but also appreciate having clear plans and guidelines.", 'high': "You prefer clear rules, structure, and predictable outcomes." } },
+        'LTO': { 'meaning': "Long-Term Orientation: Focus on future vs. past/present.", 'analysis': { 'low': "You value tradition, quick results, and short-term goals.", 'medium': "You respect tradition while also planning pragmatically for the future.", 'high': "You are pragmatic and focused on long-term, sustainable success." } },
+        'IVR': { 'meaning': "Indulgence vs. Restraint: Control of desires and impulses.", 'analysis': { 'low': "You are disciplined and prioritize social norms over personal gratification (Restraint).", 'medium': "You have a healthy balance between enjoying life and maintaining control.", 'high': "You value personal freedom, enjoying life, and expressing emotions freely (Indulgence)." } }
+    }
+}
+
+fallback_content = {
+    "development_plan": "- Seek a mentor in a field that interests you to gain practical insights.\n- Dedicate time to online courses or workshops to build specific technical skills.",
+    "swot": {
+        "S": "Your unique combination of personality and interests allows you to bring a fresh and valuable perspective to this field.", 
+        "W": "To excel, you may need to focus on developing specific technical skills or gaining more hands-on experience relevant to this career.", 
+        "O": "Emerging trends in this industry provide a great opportunity for new talent to innovate and make a significant impact.", 
+        "T": "This is a competitive field, so continuous learning and networking will be crucial to stay ahead of industry changes."
+    },
+    "conclusion": "This report is a snapshot of your potential. Use these insights as a starting point to explore the recommended career paths and continue your journey of self-discovery."
+}
+
+# Constants
+APTITUDE_FULL_NAMES = {'V': 'Verbal', 'Nu': 'Numerical', 'Sp': 'Spatial', 'LR': 'Logical Reasoning', 'Me': 'Mechanical', 'Pe': 'Perceptual', 'Ab': 'Abstract'}
+TOP_RECOMMENDATIONS = 10  # careers charted in the report; the top 3 also get a detailed analysis
+CATEGORY_TITLES = {'Aptitude': 'Aptitude', 'OCEAN': 'Personality', 'RIASEC': 'Interest', 'Hofstede': 'Cultural Values'}
+TRAIT_FULL_NAMES = {
+    'R': 'Realistic', 'I': 'Investigative', 'A': 'Artistic', 'S': 'Social', 'E': 'Enterprising', 'C': 'Conventional',
+    'O': 'Openness', 'C': 'Conscientiousness', 'E': 'Extraversion', 'A': 'Agreeableness', 'N': 'Neuroticism',
+    'PDI': 'Power Distance Index', 'IDV': 'Individualism vs. Collectivism', 'MAS': 'Masculinity vs. Femininity',
+    'UAI': 'Uncertainty Avoidance Index', 'LTO': 'Long-Term Orientation', 'IVR': 'Indulgence vs. Restraint',
+    'V': 'Verbal', 'Nu': 'Numerical', 'Sp': 'Spatial', 'LR': 'Logical Reasoning', 'Me': 'Mechanical', 'Pe': 'Perceptual', 'Ab': 'Abstract'
+}
+
+def get_score_category(score):
+    return 'low' if score < 3.5 else 'high' if score > 6.5 else 'medium'
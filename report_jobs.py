@@ -0,0 +1,74 @@
+# report_jobs.py
+# Background report jobs. Generation runs on a process-wide thread pool, outside any Streamlit
+# script run, so reruns and widget interactions neither block on it nor abandon it; a session only
+# keeps the job id and polls. Imported once per process, like gemini_client.
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+REPORT_JOB_WORKERS = int(os.environ.get("REPORT_JOB_WORKERS", 4))
+# Finished jobs are forgotten this many seconds after they complete
+REPORT_JOB_TTL = float(os.environ.get("REPORT_JOB_TTL", 3600))
+
+
+class ReportJob:
+    # Written by the worker thread, read by polling script runs
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = 'queued'  # queued | running | done | failed
+        self.stages = {}        # completed stage -> its result, in completion order
+        self.narratives = {}    # narrative texts streamed so far, for a live preview
+        self.messages = []      # (level, text) for the user, e.g. a failed save or degraded narratives
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+
+
+class ReportJobQueue:
+    def __init__(self, max_workers, ttl):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='report-job')
+        self.ttl = ttl
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        # fn(job, *args) returns the job result and may record progress on the job
+        job = ReportJob(uuid.uuid4().hex)
+        with self.lock:
+            self._expire()
+            self.jobs[job.id] = job
+        self.executor.submit(self._run, job, fn, args)
+        return job.id
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _run(self, job, fn, args):
+        job.status = 'running'
+        try:
+            job.result = fn(job, *args)
+            job.status = 'done'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            job.finished = time.time()
+
+    def _expire(self):
+        now = time.time()
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished and now - job.finished > self.ttl]:
+            del self.jobs[job_id]
+
+
+_queue = ReportJobQueue(REPORT_JOB_WORKERS, REPORT_JOB_TTL)
+
+
+def submit_report_job(fn, *args):
+    return _queue.submit(fn, *args)
+
+def get_report_job(job_id):
+    return _queue.get(job_id)
@@ -0,0 +1,88 @@
+# report_store.py
+# Finished report PDFs, kept on local disk instead of in session memory. Files are content-addressed
+# (named by the SHA-256 of the PDF), so a session only holds that short handle, and are deleted
+# REPORT_STORE_TTL seconds after they were last written or read. Imported once per process, like
+# report_jobs; several processes may share one directory.
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+REPORT_STORE_PATH = os.environ.get("REPORT_STORE_PATH") or os.path.join(tempfile.gettempdir(), "career_reports")
+REPORT_STORE_TTL = float(os.environ.get("REPORT_STORE_TTL", 24 * 3600))
+# Expired files are swept at most this often, on writes
+REPORT_STORE_SWEEP_INTERVAL = 60
+
+_HANDLE = re.compile(r'[0-9a-f]{64}')
+
+
+class ReportStore:
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self.last_sweep = 0
+        os.makedirs(path, exist_ok=True)
+
+    def put(self, pdf):
+        handle = hashlib.sha256(pdf).hexdigest()
+        path = self._file(handle)
+        self._sweep()
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Write under a temporary name and rename, so readers never see a partial file
+            fd, temp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(pdf)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        return handle
+
+    def exists(self, handle):
+        return os.path.exists(self._file(handle))
+
+    def read(self, handle):
+        # The PDF bytes, or None once the report has expired
+        path = self._file(handle)
+        try:
+            with open(path, 'rb') as f:
+                pdf = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return pdf
+
+    def _file(self, handle):
+        if not _HANDLE.fullmatch(handle):
+            raise ValueError(f"Invalid report handle: {handle!r}")
+        return os.path.join(self.path, f"{handle}.pdf")
+
+    def _sweep(self):
+        now = time.time()
+        if now - self.last_sweep < REPORT_STORE_SWEEP_INTERVAL:
+            return
+        self.last_sweep = now
+        for entry in os.scandir(self.path):
+            try:
+                if entry.name.endswith(('.pdf', '.tmp')) and now - entry.stat().st_mtime > self.ttl:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                # Already removed by another process
+                pass
+
+
+_store = ReportStore(REPORT_STORE_PATH, REPORT_STORE_TTL)
+
+
+def store_report(pdf):
+    return _store.put(pdf)
+
+def report_exists(handle):
+    return _store.exists(handle)
+
+def read_report(handle):
+    return _store.read(handle)
@@ -0,0 +1,149 @@
+# report_templates.py
+# Everything in the PDF layout that does not depend on the user: palette, stylesheet, table styles
+# and static flowables built from the text in report_content. Built once per process at import;
+# each report only creates its per-user flowables and takes its own copies of the static ones (see
+# `static`).
+import copy
+
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import Paragraph, BaseDocTemplate, PageTemplate, Frame, TableStyle
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.graphics.shapes import Drawing, Rect
+
+from questionnaire import career_descriptions
+from report_content import trait_definitions, fallback_content, CATEGORY_TITLES, TRAIT_FULL_NAMES
+from scoring import SECTION_TRAITS
+
+# Color definitions
+apple_blue = colors.Color(0, 113/255, 227/255)
+apple_dark_gray = colors.Color(45/255, 45/255, 45/255)
+apple_light_gray = colors.Color(245/255, 245/255, 247/255)
+apple_green = colors.Color(52/255, 199/255, 89/255)
+apple_red = colors.Color(255/255, 69/255, 58/255)
+apple_orange = colors.Color(255/255, 159/255, 10/255)
+apple_teal = colors.Color(90/255, 200/255, 250/255)
+
+def header_footer(canvas, doc):
+    canvas.saveState()
+    canvas.setFont('Helvetica-Bold', 9)
+    canvas.setFillColor(apple_blue)
+    canvas.drawRightString(doc.width + doc.leftMargin, doc.height + doc.topMargin - 0.5 * inch, "Thinkareer")
+    canvas.line(inch, doc.height + doc.topMargin - 0.55 * inch, doc.width + doc.leftMargin, doc.height + doc.topMargin - 0.55 * inch)
+    canvas.drawString(inch, 0.75 * inch, f"Page {doc.page}")
+    canvas.restoreState()
+
+def create_score_bar(score, width=4*inch, height=0.3*inch):
+    drawing = Drawing(width, height)
+    num_segments = 10
+    segment_width = width / num_segments
+    filled_segments = int(round(score / 10 * num_segments))
+    
+    for i in range(num_segments):
+        drawing.add(Rect(
+            i * segment_width, 0, segment_width - 2, height,
+            fillColor=apple_green if i < filled_segments else apple_light_gray,
+            strokeColor=None
+        ))
+    
+    return drawing
+
+
+# --- Stylesheet ---
+def _build_styles():
+    styles = getSampleStyleSheet()
+    
+    # Add custom styles
+    styles.add(ParagraphStyle(name='AppleTitle', fontName='Helvetica-Bold', fontSize=32, textColor=apple_dark_gray, alignment=0, spaceAfter=24))
+    styles.add(ParagraphStyle(name='AppleH1', fontName='Helvetica-Bold', fontSize=20, textColor=apple_blue, spaceAfter=16, leading=24))
+    styles.add(ParagraphStyle(name='AppleH2', fontName='Helvetica-Bold', fontSize=14, textColor=apple_dark_gray, spaceAfter=8, leading=18))
+    styles.add(ParagraphStyle(name='AppleBody', fontName='Helvetica', fontSize=11, textColor=apple_dark_gray, spaceAfter=12, leading=16))
+    styles.add(ParagraphStyle(name='AppleList', parent=styles['AppleBody'], leftIndent=18))
+    styles.add(ParagraphStyle(name='AppleSubtitle', fontName='Helvetica', fontSize=11, textColor=colors.grey, spaceBefore=-5, spaceAfter=12))
+    styles.add(ParagraphStyle(name='AppleH2_Boxed', parent=styles['AppleH2'], backColor=apple_light_gray, borderColor=colors.lightgrey, borderWidth=1, borderPadding=8))
+    
+    # SWOT styles
+    styles.add(ParagraphStyle(name='SWOTKey_S', fontName='Helvetica-Bold', fontSize=16, textColor=colors.white, backColor=apple_green, alignment=1, borderRadius=5, padding=5))
+    styles.add(ParagraphStyle(name='SWOTKey_W', parent=styles['SWOTKey_S'], backColor=apple_orange))
+    styles.add(ParagraphStyle(name='SWOTKey_O', parent=styles['SWOTKey_S'], backColor=apple_teal))
+    styles.add(ParagraphStyle(name='SWOTKey_T', parent=styles['SWOTKey_S'], backColor=apple_red))
+    return styles
+
+STYLES = _build_styles()
+
+TOC_ENTRIES = [
+    "Personal Profile",
+    "Aptitude Analysis",
+    "Personality Analysis (OCEAN)",
+    "Interest Analysis (RIASEC)",
+    "Cultural Values Analysis (Hofstede)",
+    "Top Career Recommendations",
+    "Detailed Career Analysis",
+    "Conclusion"
+]
+TOC_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
+    ('FONTSIZE', (0,0), (-1,-1), 12),
+    ('TEXTCOLOR', (0,0), (-1,-1), apple_dark_gray),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 12),
+    ('LINEBELOW', (0,0), (-1,-1), 1, apple_light_gray)
+])
+PROFILE_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
+    ('FONTSIZE', (0,0), (-1,-1), 11),
+    ('TEXTCOLOR', (0,0), (-1,-1), apple_dark_gray),
+    ('LEFTPADDING', (0,0), (-1,-1), 0),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 8),
+    ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold')
+])
+SWOT_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0,0), (-1,-1), 'TOP'),
+    ('LINEBELOW', (0,0), (-1,-2), 1, colors.lightgrey),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 12),
+    ('TOPPADDING', (0,1), (-1,-1), 12)
+])
+
+
+# --- Static Flowables ---
+# Paragraphs whose text never changes are parsed once here. Flowables keep layout state while a
+# document is built, so reports never use these directly; `static` hands out a shallow copy.
+# Score bars are not shared: rendering a drawing marks up each of its shapes, and copying the shapes
+# costs as much as building the bar.
+def _build_static_flowables():
+    flowables = {
+        ('title',): Paragraph("Career Discovery Report", STYLES['AppleTitle']),
+        ('dev_plan_label',): Paragraph("<b>Development Plan:</b>", STYLES['AppleBody'])
+    }
+    for heading in ["Table of Contents", "Personal Profile", "Top Career Recommendations", "Detailed Career Analysis", "Conclusion"] + [f"{title} Analysis" for title in CATEGORY_TITLES.values()]:
+        flowables[('h1', heading)] = Paragraph(heading, STYLES['AppleH1'])
+    
+    for category, traits in SECTION_TRAITS.items():
+        for trait in traits:
+            definition = trait_definitions.get(category, {}).get(trait, {})
+            flowables[('trait_heading', trait)] = Paragraph(f"{TRAIT_FULL_NAMES.get(trait, trait)}", STYLES['AppleH2'])
+            flowables[('meaning', category, trait)] = Paragraph(f"<b>Meaning:</b> {definition.get('meaning', 'N/A')}", STYLES['AppleBody'])
+            for score_cat in ('low', 'medium', 'high'):
+                analysis_text = definition.get('analysis', {}).get(score_cat, 'N/A')
+                flowables[('analysis', category, trait, score_cat)] = Paragraph(f"<b>Expert Analysis:</b> {analysis_text}", STYLES['AppleBody'])
+    
+    for key in fallback_content["swot"]:
+        flowables[('swot_key', key)] = Paragraph(key, STYLES[f'SWOTKey_{key}'])
+    for career, description in career_descriptions.items():
+        flowables[('career_description', career)] = Paragraph(description, STYLES['AppleBody'])
+    flowables[('career_description', None)] = Paragraph("No description available for this career.", STYLES['AppleBody'])
+    return flowables
+
+STATIC_FLOWABLES = _build_static_flowables()
+
+def static(*key):
+    return copy.copy(STATIC_FLOWABLES[key])
+
+def create_doc(buffer):
+    # Frames and page templates track their position while a document is built, so each report
+    # gets its own; only the geometry and page decoration are shared
+    doc = BaseDocTemplate(buffer, pagesize=letter, rightMargin=inch, leftMargin=inch, topMargin=inch, bottomMargin=inch)
+    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
+    doc.addPageTemplates([PageTemplate(id='main', frames=[frame], onPage=header_footer)])
+    return doc
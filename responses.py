@@ -0,0 +1,86 @@
+# responses.py
+# Compact encoding of questionnaire answers: one uint8 per item in the compiled schema order,
+# where 0 means unanswered and n means the item's n-th option. A full submission is under 200 bytes.
+import numpy as np
+
+from scoring import SCHEMA, LIKERT_SECTIONS
+
+
+class ResponseVector:
+    __slots__ = ('codes', 'fingerprint')
+
+    def __init__(self, codes=None, fingerprint=None):
+        if fingerprint is not None and fingerprint != SCHEMA.fingerprint:
+            raise ValueError("Responses were encoded against a different questionnaire")
+        self.codes = np.zeros(len(SCHEMA.item_keys), dtype=np.uint8) if codes is None else np.asarray(codes, dtype=np.uint8)
+        if self.codes.shape != (len(SCHEMA.item_keys),):
+            raise ValueError(f"Expected {len(SCHEMA.item_keys)} item codes, got shape {self.codes.shape}")
+        self.fingerprint = SCHEMA.fingerprint
+
+    def get(self, key, default=None):
+        # The answer label for an item key such as "OCEAN_Openness_2", or default when unanswered
+        position = SCHEMA.item_index[key]
+        code = self.codes[position]
+        return SCHEMA.item_options[position][code - 1] if code else default
+
+    def set(self, key, label):
+        position = SCHEMA.item_index[key]
+        if label is None:
+            self.codes[position] = 0
+            return
+        try:
+            self.codes[position] = SCHEMA.item_options[position].index(label) + 1
+        except ValueError:
+            raise ValueError(f"'{label}' is not an option for {key}") from None
+
+    def answered(self):
+        return int(np.count_nonzero(self.codes))
+
+    # --- Persistence ---
+    def to_bytes(self):
+        return self.fingerprint + self.codes.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        size = len(SCHEMA.fingerprint)
+        return cls(np.frombuffer(data[size:], dtype=np.uint8).copy(), bytes(data[:size]))
+
+    @classmethod
+    def from_user_data(cls, user_data):
+        # Encodes the nested answer dicts kept in user_data (e.g. archived submissions). Built as a
+        # list and converted once, since bulk_score encodes every archived row this way.
+        codes = [0] * len(SCHEMA.item_keys)
+        for section in LIKERT_SECTIONS + ['Aptitude']:
+            for key, label in user_data.get(section, {}).items():
+                item = SCHEMA.item_codes.get(key)
+                if item is None or label is None:
+                    continue
+                position, options = item
+                code = options.get(label)
+                if code is None:
+                    raise ValueError(f"'{label}' is not an option for {key}")
+                codes[position] = code
+        return cls(np.array(codes, dtype=np.uint8))
+
+    def to_user_data(self):
+        user_data = {}
+        for key, options, code in zip(SCHEMA.item_keys, SCHEMA.item_options, self.codes):
+            if code:
+                section = 'Aptitude' if key.startswith('aptitude_') else key.split('_', 1)[0]
+                user_data.setdefault(section, {})[key] = options[code - 1]
+        return user_data
+
+    # --- Hashing ---
+    def __eq__(self, other):
+        return isinstance(other, ResponseVector) and self.to_bytes() == other.to_bytes()
+
+    def __hash__(self):
+        return hash(self.to_bytes())
+
+    def __repr__(self):
+        return f"ResponseVector({self.answered()}/{len(self.codes)} answered)"
+
+
+def stack_responses(vectors):
+    # (n, item) uint8 matrix for batch scoring with scoring.score_response_matrix
+    return np.stack([vector.codes for vector in vectors]) if vectors else np.zeros((0, len(SCHEMA.item_keys)), dtype=np.uint8)
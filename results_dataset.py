@@ -0,0 +1,324 @@
+# results_dataset.py
+# Columnar archive of every submission: one row per result, with every trait score and the full
+# ranked recommendations, in Parquet files partitioned by submission date (date=YYYY-MM-DD/). The
+# query functions below read it as an Arrow dataset and scan only the columns (and dates) they use.
+# Rows are buffered and written one file per RESULTS_BATCH_SIZE rows or RESULTS_FLUSH_INTERVAL
+# seconds, so the dataset does not fill up with one-row files. Imported once per process, like
+# gemini_client. Import scored records from bulk_score.py and query from the command line with:
+#   python results_dataset.py import scored.jsonl
+#   python results_dataset.py careers --by status --top 3
+#   python results_dataset.py scores RIASEC Realistic --by age_band
+#   python results_dataset.py summary --by status --since 2026-01-01
+import argparse
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from lazy_import import lazy_import
+from scoring import SECTION_TRAITS
+
+# Loaded when the first result is written or queried
+try:
+    pa = lazy_import("pyarrow")
+    pc = lazy_import("pyarrow.compute")
+    ds = lazy_import("pyarrow.dataset")
+    pq = lazy_import("pyarrow.parquet")
+except ImportError:  # optional: without pyarrow results are not archived
+    pa = None
+
+# Set RESULTS_DATASET_PATH to an empty string to disable the archive
+RESULTS_DATASET_PATH = os.environ.get("RESULTS_DATASET_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "results_dataset"))
+RESULTS_BATCH_SIZE = int(os.environ.get("RESULTS_BATCH_SIZE", 100))
+RESULTS_FLUSH_INTERVAL = float(os.environ.get("RESULTS_FLUSH_INTERVAL", 60))
+# While the dataset cannot be written, results are kept (up to RESULTS_MAX_PENDING, oldest dropped
+# first) and retried after RESULTS_RETRY_DELAY seconds, doubling on every further failure
+RESULTS_MAX_PENDING = int(os.environ.get("RESULTS_MAX_PENDING", 10000))
+RESULTS_RETRY_DELAY = float(os.environ.get("RESULTS_RETRY_DELAY", 5))
+RESULTS_MAX_RETRY_DELAY = 300
+AGE_BAND_WIDTH = 5
+
+
+def score_column(section, trait):
+    return f"{section}_{trait}"
+
+SCORE_COLUMNS = [score_column(section, trait) for section, traits in SECTION_TRAITS.items() for trait in traits]
+
+def results_schema():
+    return pa.schema(
+        [('result_id', pa.string()), ('submitted_at', pa.timestamp('s')), ('name', pa.string()), ('email', pa.string()),
+         ('age', pa.int16()), ('status', pa.string())] +
+        [(column, pa.float32()) for column in SCORE_COLUMNS] +
+        [('recommendations', pa.list_(pa.struct([('career', pa.string()), ('score', pa.float32()), ('match', pa.string())])))]
+    )
+
+def result_record(profile, recommendations, submitted_at=None):
+    # One dataset row from a client profile (scoring.prepare_client_profile) and its ranked recommendations
+    try:
+        age = int(profile.get('age'))
+    except (TypeError, ValueError):
+        age = None
+    record = {
+        'result_id': uuid.uuid4().hex,
+        'submitted_at': submitted_at or datetime.now(),
+        'name': profile.get('name'),
+        'email': profile.get('email'),
+        'age': age,
+        'status': profile.get('status')
+    }
+    for section, traits in SECTION_TRAITS.items():
+        for trait in traits:
+            record[score_column(section, trait)] = profile.get(section, {}).get(trait)
+    record['recommendations'] = [{'career': career, 'score': score, 'match': match} for career, score, match in recommendations]
+    return record
+
+
+# --- Writing ---
+class ResultsWriter:
+    def __init__(self, path, batch_size, flush_interval, max_pending=None, retry_delay=RESULTS_RETRY_DELAY):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.retry_delay = retry_delay
+        self.pending = []
+        self.oldest = None
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.thread = None
+        self.closing = False
+        self.failures = 0
+        self.retry_at = None
+        self.dropped = 0
+        self.last_error = None
+
+    def append(self, record):
+        with self.condition:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='results-writer', daemon=True)
+                self.thread.start()
+            if not self.pending:
+                self.oldest = time.monotonic()
+            self.pending.append(record)
+            self._trim()
+            # The first record starts the flush-interval clock the writer waits on
+            if len(self.pending) == 1 or len(self.pending) >= self.batch_size:
+                self.condition.notify()
+
+    def flush(self):
+        # Writes everything buffered now; raises if a file cannot be written
+        with self.condition:
+            records, self.pending = self.pending, []
+        _, error = self._write(records)
+        if error is not None:
+            raise error
+
+    def close(self, timeout=30):
+        # Writes whatever is still buffered; registered to run at interpreter exit
+        with self.condition:
+            self.closing = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def _trim(self):
+        # While writes keep failing the buffer is bounded; the oldest results are dropped first
+        if self.max_pending is not None and len(self.pending) > self.max_pending:
+            excess = len(self.pending) - self.max_pending
+            del self.pending[:excess]
+            self.dropped += excess
+
+    def _wait_time(self):
+        # Seconds until the buffer is due to be written (<= 0: now), or None while it is empty.
+        # After a failed write the next attempt waits for the backoff instead of the batch.
+        if not self.pending:
+            return None
+        if self.retry_at is not None:
+            return self.retry_at - time.monotonic()
+        if len(self.pending) >= self.batch_size:
+            return 0
+        return self.oldest + self.flush_interval - time.monotonic()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.closing:
+                    wait = self._wait_time()
+                    if wait is not None and wait <= 0:
+                        break
+                    self.condition.wait(wait)
+                closing = self.closing
+                records, self.pending = self.pending, []
+            failed, error = self._write(records)
+            with self.condition:
+                if error is None:
+                    self.failures = 0
+                    self.retry_at = None
+                else:
+                    # Keep the results that were not written, ahead of any that arrived meanwhile
+                    self.failures += 1
+                    self.last_error = str(error)
+                    self.pending = failed + self.pending
+                    self.oldest = time.monotonic()
+                    self._trim()
+                    delay = min(RESULTS_MAX_RETRY_DELAY, self.retry_delay * 2 ** (self.failures - 1))
+                    self.retry_at = time.monotonic() + delay
+                    print(f"Could not archive {len(failed)} results to {self.path} ({error}); retrying in {delay:.0f}s"
+                          f"{f', {self.dropped} dropped so far' if self.dropped else ''}", file=sys.stderr)
+            if closing:
+                return
+
+    def _write(self, records):
+        # One Parquet file per submission date; written under a hidden name and renamed into place,
+        # so queries never read a partial file. Returns (records not written, the first error or None).
+        days = {}
+        for record in records:
+            days.setdefault(record['submitted_at'].strftime("%Y-%m-%d"), []).append(record)
+        failed, error = [], None
+        with self.write_lock:
+            for day, rows in days.items():
+                try:
+                    directory = os.path.join(self.path, f"date={day}")
+                    os.makedirs(directory, exist_ok=True)
+                    name = f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+                    temp_path = os.path.join(directory, f".{name}")
+                    pq.write_table(pa.Table.from_pylist(rows, schema=results_schema()), temp_path, compression='zstd')
+                    os.replace(temp_path, os.path.join(directory, name))
+                except Exception as e:
+                    failed.extend(rows)
+                    error = error or e
+        return failed, error
+
+
+_writer = ResultsWriter(RESULTS_DATASET_PATH, RESULTS_BATCH_SIZE, RESULTS_FLUSH_INTERVAL, RESULTS_MAX_PENDING) if pa is not None and RESULTS_DATASET_PATH else None
+if _writer is not None:
+    atexit.register(_writer.close)
+elif RESULTS_DATASET_PATH:
+    print("pyarrow is not installed; results will not be archived to the dataset.", file=sys.stderr)
+
+
+def archive_result(profile, recommendations):
+    # Buffers the result for the dataset; returns False when archiving is disabled or pyarrow is missing
+    if _writer is None:
+        return False
+    _writer.append(result_record(profile, recommendations))
+    return True
+
+def import_scored(path, dataset_path=RESULTS_DATASET_PATH):
+    # Adds the JSONL output of bulk_score.py, dated by each profile's 'date'
+    writer = ResultsWriter(dataset_path, RESULTS_BATCH_SIZE, RESULTS_FLUSH_INTERVAL)
+    count = 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                scored = json.loads(line)
+                profile = scored['profile']
+                submitted_at = datetime.strptime(profile['date'], "%Y-%m-%d") if profile.get('date') else None
+                writer.pending.append(result_record(profile, scored['recommendations'], submitted_at))
+                count += 1
+                if len(writer.pending) >= 10000:
+                    writer.flush()
+    writer.flush()
+    return count
+
+
+# --- Queries ---
+def load_results(columns, since=None, until=None, where=None, path=RESULTS_DATASET_PATH):
+    # Reads only `columns` (plus 'age_band', derived from age) for submissions dated since..until
+    # (inclusive 'YYYY-MM-DD' strings, pruned by partition); `where` is an optional dataset expression
+    dataset = ds.dataset(path, format='parquet', schema=results_schema().append(pa.field('date', pa.string())),
+                         partitioning=ds.partitioning(pa.schema([('date', pa.string())]), flavor='hive'))
+    condition = where
+    for bound in [ds.field('date') >= since if since else None, ds.field('date') <= until if until else None]:
+        if bound is not None:
+            condition = bound if condition is None else condition & bound
+    read = dict.fromkeys('age' if column == 'age_band' else column for column in columns)
+    table = dataset.to_table(columns=list(read), filter=condition)
+    if 'age_band' in columns:
+        bands = pc.multiply(pc.floor(pc.divide(pc.cast(table['age'], pa.float64()), AGE_BAND_WIDTH)), AGE_BAND_WIDTH)
+        table = table.append_column('age_band', pc.cast(bands, pa.int16()))
+        if 'age' not in columns:
+            table = table.drop_columns(['age'])
+    return table
+
+def _flat(column):
+    return column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+
+def _count(table, keys):
+    counts = table.group_by(keys).aggregate([([], 'count_all')]).rename_columns(keys + ['count'])
+    return counts.sort_by([(key, 'ascending') for key in keys[:-1]] + [('count', 'descending'), (keys[-1], 'ascending')])
+
+def score_distribution(section, trait, by=None, bins=10, **filters):
+    # Histogram of one trait score over 0-10 in `bins` equal bins, optionally per group (e.g. 'status',
+    # 'age_band'): a table of (by, bin_start, count)
+    column = score_column(section, trait)
+    table = load_results([column] + ([by] if by else []), **filters)
+    width = 10 / bins
+    bin_index = pc.min_element_wise(pc.floor(pc.divide(pc.cast(table[column], pa.float64()), width)), bins - 1)
+    binned = pa.table({'bin_start': pc.multiply(bin_index, width), **({by: table[by]} if by else {})}).filter(pc.is_valid(bin_index))
+    counts = binned.group_by(([by] if by else []) + ['bin_start']).aggregate([([], 'count_all')]).rename_columns(([by] if by else []) + ['bin_start', 'count'])
+    return counts.sort_by(([(by, 'ascending')] if by else []) + [('bin_start', 'ascending')])
+
+def trait_summary(columns=None, by=None, **filters):
+    # Mean, standard deviation and count of each score column (default: all), optionally per group
+    columns = columns or SCORE_COLUMNS
+    table = load_results(columns + ([by] if by else []), **filters)
+    aggregations = [(column, function) for column in columns for function in ('mean', 'stddev', 'count')]
+    summary = table.group_by([by] if by else []).aggregate(aggregations)
+    return summary.sort_by(by) if by else summary
+
+def career_frequency(by=None, top=1, **filters):
+    # How often each career appears in users' top `top` recommendations, optionally per group:
+    # a table of (by, career, count), most frequent first
+    table = load_results(['recommendations'] + ([by] if by else []), **filters)
+    top_lists = pc.list_slice(_flat(table['recommendations']), 0, top)
+    columns = {'career': pc.struct_field(pc.list_flatten(top_lists), 'career')}
+    if by:
+        columns = {by: pc.take(_flat(table[by]), pc.list_parent_indices(top_lists)), **columns}
+    return _count(pa.table(columns), ([by] if by else []) + ['career'])
+
+
+def _print_table(table, limit):
+    print("\t".join(table.column_names))
+    for row in table.slice(0, limit).to_pylist():
+        print("\t".join(f"{value:.2f}" if isinstance(value, float) else str(value) for value in row.values()))
+
+
+if __name__ == "__main__":
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--path", default=RESULTS_DATASET_PATH)
+    common.add_argument("--since", help="First submission date, YYYY-MM-DD")
+    common.add_argument("--until", help="Last submission date, YYYY-MM-DD")
+    common.add_argument("--limit", type=int, default=50, help="Rows to print")
+    parser = argparse.ArgumentParser(description="Archive and query questionnaire results.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser("import", parents=[common], help="Add bulk_score.py output to the dataset")
+    command.add_argument("input")
+    command = commands.add_parser("careers", parents=[common], help="Career frequency in users' top recommendations")
+    command.add_argument("--by")
+    command.add_argument("--top", type=int, default=1)
+    command = commands.add_parser("scores", parents=[common], help="Distribution of one trait score")
+    command.add_argument("section")
+    command.add_argument("trait")
+    command.add_argument("--by")
+    command.add_argument("--bins", type=int, default=10)
+    command = commands.add_parser("summary", parents=[common], help="Mean and spread of trait scores")
+    command.add_argument("--by")
+    command.add_argument("--columns", nargs="+")
+    args = parser.parse_args()
+    if pa is None:
+        parser.exit(1, "pyarrow is required to import or query results (pip install pyarrow).\n")
+
+    filters = {'since': args.since, 'until': args.until, 'path': args.path}
+    if args.command == "import":
+        print(f"Imported {import_scored(args.input, args.path)} results into {args.path}")
+    elif args.command == "careers":
+        _print_table(career_frequency(args.by, args.top, **filters), args.limit)
+    elif args.command == "scores":
+        _print_table(score_distribution(args.section, args.trait, args.by, args.bins, **filters), args.limit)
+    else:
+        _print_table(trait_summary(args.columns, args.by, **filters), args.limit)
@@ -0,0 +1,170 @@
+# scoring.py
+# Turns raw questionnaire answers (user_data) into a client profile of per-section trait scores.
+# Kept free of Streamlit so command-line tools and worker processes can import it cheaply.
+import hashlib
+from datetime import datetime
+
+import numpy as np
+
+from questionnaire import questions, aptitude_questions
+
+RIASEC = ["Realistic", "Investigative", "Artistic", "Social", "Enterprising", "Conventional"]
+OCEAN = ["Openness", "Conscientiousness", "Extraversion", "Agreeableness", "Neuroticism"]
+HOFSTEDE = ["PDI", "IDV", "MAS", "UAI", "LTO", "IVR"]
+APTITUDE = ['V', 'Nu', 'Sp', 'LR', 'Me', 'Pe', 'Ab']
+SECTION_TRAITS = {'Aptitude': APTITUDE, 'OCEAN': OCEAN, 'RIASEC': RIASEC, 'Hofstede': HOFSTEDE}
+LIKERT_SECTIONS = ['RIASEC', 'OCEAN', 'Hofstede']
+LIKERT_POINTS = 5
+LIKERT_STEP = 10 / (LIKERT_POINTS - 1)  # option i of a 5-point scale scores i * 2.5 on the 0-10 scale
+NEUTRAL_SCORE = LIKERT_STEP * (LIKERT_POINTS // 2)
+
+
+# --- Compiled Questionnaire Schema ---
+class QuestionnaireSchema:
+    # Compiled once at import from `questions` and `aptitude_questions`:
+    #   item_keys      every item in a fixed order, e.g. "RIASEC_Realistic_3" or "aptitude_V_2"
+    #   item_index     item key -> position in item_keys
+    #   item_options   per item, the option labels in display order
+    #   item_codes     item key -> (position, {option label: encoded answer, i.e. 1 + its position})
+    #   item_values    per Likert item, option label -> score on the 0-10 scale
+    #   trait_items    Likert section -> trait -> [(item key, label values)] for single-pass scoring
+    #   trait_columns  section -> trait -> item positions, for scoring encoded responses
+    #   points         (item, code) -> points, where code is 1 + the option position and 0 is unanswered
+    #                  (NaN for skipped Likert items, neutral for Hofstede, 1 for a correct aptitude answer)
+    #   fingerprint    digest of the item order and options; encoded responses carry it
+    def __init__(self, questions, aptitude_questions):
+        self.item_keys = []
+        self.item_options = []
+        self.item_values = []
+        self.trait_items = {}
+        self.trait_columns = {}
+        rows = []
+        for section in LIKERT_SECTIONS:
+            self.trait_items[section] = {}
+            self.trait_columns[section] = {}
+            for trait in SECTION_TRAITS[section]:
+                if not questions.get(section, {}).get(trait):
+                    raise ValueError(f"Questionnaire has no items for {section} trait '{trait}'")
+                trait_items = []
+                self.trait_columns[section][trait] = np.arange(len(self.item_keys), len(self.item_keys) + len(questions[section][trait]))
+                for i, (question, options) in enumerate(questions[section][trait], 1):
+                    key = f"{section}_{trait}_{i}"
+                    if len(options) != LIKERT_POINTS or len(set(options)) != LIKERT_POINTS:
+                        raise ValueError(f"{key} must have {LIKERT_POINTS} distinct options, got {options}")
+                    values = {label: position * LIKERT_STEP for position, label in enumerate(options)}
+                    self.item_keys.append(key)
+                    self.item_options.append(tuple(options))
+                    self.item_values.append(values)
+                    trait_items.append((key, values))
+                    rows.append([NEUTRAL_SCORE if section == 'Hofstede' else np.nan] + list(values.values()))
+                self.trait_items[section][trait] = trait_items
+
+        self.trait_columns['Aptitude'] = {}
+        for trait in APTITUDE:
+            if not aptitude_questions.get(trait):
+                raise ValueError(f"Questionnaire has no aptitude items for '{trait}'")
+            self.trait_columns['Aptitude'][trait] = np.arange(len(self.item_keys), len(self.item_keys) + len(aptitude_questions[trait]))
+            for i, (question, options, correct) in enumerate(aptitude_questions[trait], 1):
+                key = f"aptitude_{trait}_{i}"
+                if len(set(options)) != len(options):
+                    raise ValueError(f"{key} must have distinct options, got {options}")
+                self.item_keys.append(key)
+                self.item_options.append(tuple(options))
+                self.item_values.append(None)
+                # Matched by label exactly as the aptitude page does, so an answer missing from the options never scores
+                rows.append([0.0] + [float(label == correct) for label in options])
+
+        self.item_index = {key: position for position, key in enumerate(self.item_keys)}
+        self.item_codes = {
+            key: (position, {label: code for code, label in enumerate(options, 1)})
+            for position, (key, options) in enumerate(zip(self.item_keys, self.item_options))
+        }
+        width = max(len(row) for row in rows)
+        self.points = np.full((len(rows), width), np.nan)
+        for position, row in enumerate(rows):
+            self.points[position, :len(row)] = row
+        self.fingerprint = hashlib.sha256(repr(list(zip(self.item_keys, self.item_options))).encode('utf-8')).digest()[:8]
+
+
+SCHEMA = QuestionnaireSchema(questions, aptitude_questions)
+
+
+def prepare_client_profile(user_data, responses=None):
+    # responses is an encoded ResponseVector; when given, the section scores come from it and the
+    # answer dicts in user_data are ignored
+    profile = profile_details(user_data)
+    if responses is not None:
+        scores = score_response_matrix(responses.codes[None])
+        for section, traits in SECTION_TRAITS.items():
+            profile[section] = {trait: float(score) for trait, score in zip(traits, scores[section][0])}
+    else:
+        for section in SECTION_TRAITS.keys():
+            profile[section] = calculate_section_scores(section, user_data)
+    
+    return profile
+
+def profile_details(user_data):
+    # Everything in a client profile except the section scores
+    profile = {
+        'name': user_data.get('name', ''),
+        'age': user_data.get('age', 0),
+        'status': user_data.get('class_or_occupation', ''),
+        'email': user_data.get('email', ''),
+        'phone': user_data.get('phone', ''),
+        'date': datetime.now().strftime("%Y-%m-%d")
+    }
+    
+    text_keys = ['hobbies', 'interests', 'skills', 'competitive_subjects', 'easy_tasks', 'passion', 'big_problems', 'topics_of_interest', 'extra_benefit', 'future_opportunities']
+    for key in text_keys:
+        if key in user_data and isinstance(user_data[key], str):
+            profile[key] = [item.strip() for item in user_data[key].split(',') if item.strip()]
+        else:
+            profile[key] = []
+    return profile
+
+def calculate_section_scores(section_name, user_data):
+    section_data = user_data.get(section_name, {})
+    scores = {}
+    
+    if section_name == 'Aptitude':
+        for trait in APTITUDE:
+            scores[trait] = section_data.get(trait, 0) / 10
+    elif section_name in SCHEMA.trait_items:
+        for trait, items in SCHEMA.trait_items[section_name].items():
+            trait_scores = []
+            for key, values in items:
+                label = section_data.get(key)
+                if label is None:
+                    # Unanswered Hofstede items count as neutral; unanswered interest/personality items are skipped
+                    if section_name == 'Hofstede':
+                        trait_scores.append(NEUTRAL_SCORE)
+                    continue
+                if label not in values:
+                    raise ValueError(f"'{label}' is not an option for {key}")
+                trait_scores.append(values[label])
+            scores[trait] = sum(trait_scores) / len(trait_scores) if trait_scores else 0
+    
+    return scores
+
+def score_response_matrix(codes):
+    # codes is an (n, item) uint8 array of encoded responses; returns {section: (n, trait) scores}
+    # with the same meaning as calculate_section_scores, for a whole cohort in one pass
+    if codes.shape[1] != len(SCHEMA.item_keys):
+        raise ValueError(f"Expected {len(SCHEMA.item_keys)} items per response, got {codes.shape[1]}")
+    points = SCHEMA.points[np.arange(len(SCHEMA.item_keys)), codes]
+    scores = {}
+    for section, traits in SECTION_TRAITS.items():
+        columns = SCHEMA.trait_columns[section]
+        section_scores = np.zeros((len(codes), len(traits)))
+        for t, trait in enumerate(traits):
+            trait_points = points[:, columns[trait]]
+            if section == 'Aptitude':
+                # Share of correct answers, on the same 0-10 scale as the saved percentage / 10
+                section_scores[:, t] = trait_points.mean(axis=1) * 10
+            else:
+                answered = ~np.isnan(trait_points)
+                counts = answered.sum(axis=1)
+                totals = np.where(answered, trait_points, 0).sum(axis=1)
+                section_scores[:, t] = np.divide(totals, counts, out=np.zeros(len(codes)), where=counts > 0)
+        scores[section] = section_scores
+    return scores
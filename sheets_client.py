@@ -0,0 +1,209 @@
+# sheets_client.py
+# Results archive in Google Sheets. A submission's row is first committed to a local SQLite outbox
+# (WAL mode, so the write is a local append that survives restarts) and the user never waits on the
+# network. A background syncer drains the outbox with one append_rows call per batch, when
+# SHEETS_BATCH_SIZE rows are waiting or the oldest has waited SHEETS_FLUSH_INTERVAL seconds, which
+# keeps write requests far under the Sheets per-minute quota. While Sheets is unreachable rows simply
+# stay in the outbox and the syncer backs off. The authorized worksheet handle is created once per
+# process. Imported once per process, like gemini_client; use one server process per outbox file.
+#
+# Every row carries its outbox id in a trailing column. When a send may or may not have reached the
+# sheet (it failed, or the process stopped before the outbox was updated), the syncer reads that
+# column before sending again and skips rows already there, so each result is appended once.
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+from lazy_import import lazy_import
+
+# Only needed once the syncer connects
+gspread = lazy_import("gspread")
+service_account = lazy_import("oauth2client.service_account")
+
+SHEETS_SPREADSHEET = os.environ.get("SHEETS_SPREADSHEET", "Career App Results")
+SHEETS_WORKSHEET = os.environ.get("SHEETS_WORKSHEET", "Sheet 1")
+SHEETS_OUTBOX_PATH = os.environ.get("SHEETS_OUTBOX_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "results_outbox.sqlite3"))
+SHEETS_BATCH_SIZE = int(os.environ.get("SHEETS_BATCH_SIZE", 50))
+SHEETS_FLUSH_INTERVAL = float(os.environ.get("SHEETS_FLUSH_INTERVAL", 5))
+# After a failed send the syncer waits SHEETS_RETRY_DELAY seconds, doubling on every further failure
+SHEETS_RETRY_DELAY = float(os.environ.get("SHEETS_RETRY_DELAY", 2))
+SHEETS_MAX_RETRY_DELAY = 300
+SHEETS_SCOPE = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+
+
+def sheets_configured():
+    return bool(os.environ.get("gcp_service_account"))
+
+def open_worksheet():
+    creds_dict = json.loads(os.environ["gcp_service_account"])
+    creds = service_account.ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, SHEETS_SCOPE)
+    client = gspread.authorize(creds)
+    return client.open(SHEETS_SPREADSHEET).worksheet(SHEETS_WORKSHEET)
+
+
+class SheetOutbox:
+    def __init__(self, path, open_worksheet, batch_size, flush_interval, retry_delay):
+        self.open_worksheet = open_worksheet
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+        self.worksheet = None
+        self.condition = threading.Condition()
+        self.thread = None
+        self.closing = False
+        # Rows left over from an earlier process may have been sent without being marked
+        self.uncertain = True
+        self.failures = 0
+        self.retry_at = None
+        self.rows_written = 0
+        self.rows_deduplicated = 0
+        self.batches = 0
+        self.last_error = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only risks the last commits on power loss, never on a process crash
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS outbox (id TEXT PRIMARY KEY, row TEXT NOT NULL, created REAL NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS outbox_created ON outbox (created)")
+        self.conn.commit()
+
+    def append(self, row):
+        # Commits the row locally and returns its id; the syncer sends it later
+        row_id = uuid.uuid4().hex
+        with self.condition:
+            self.conn.execute("INSERT INTO outbox (id, row, created) VALUES (?, ?, ?)", (row_id, json.dumps(row), time.time()))
+            self.conn.commit()
+            self._start()
+            self.condition.notify()
+        return row_id
+
+    def start(self):
+        # Begins draining rows left from earlier runs
+        with self.condition:
+            self._start()
+
+    def close(self, timeout=30):
+        # Sends whatever is due; anything left stays in the outbox for the next run
+        with self.condition:
+            self.closing = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def stats(self):
+        with self.condition:
+            pending = self.conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+            return {
+                'pending': pending,
+                'rows_written': self.rows_written,
+                'rows_deduplicated': self.rows_deduplicated,
+                'batches': self.batches,
+                'failures': self.failures,
+                'last_error': self.last_error
+            }
+
+    def _start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='sheet-outbox', daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while True:
+                    batch, wait = self._next_batch()
+                    if batch or self.closing:
+                        break
+                    self.condition.wait(wait)
+                # While Sheets is failing, closing does not wait on another attempt; the rows stay in the outbox
+                if not batch or self.closing and self.failures:
+                    return
+            if self._send(batch):
+                self.retry_at = None
+            else:
+                self.retry_at = time.time() + min(SHEETS_MAX_RETRY_DELAY, self.retry_delay * 2 ** (self.failures - 1))
+
+    def _next_batch(self):
+        # ([(id, row)], None) when a batch is due, else ([], seconds until one may be). After a failed
+        # send nothing is due until the backoff has passed, however many rows arrive meanwhile.
+        if self.retry_at is not None and not self.closing and self.retry_at > time.time():
+            return [], self.retry_at - time.time()
+        rows = self.conn.execute("SELECT id, row, created FROM outbox ORDER BY created LIMIT ?", (self.batch_size,)).fetchall()
+        if not rows:
+            return [], None
+        wait = rows[0][2] + self.flush_interval - time.time()
+        if len(rows) >= self.batch_size or wait <= 0 or self.closing:
+            return [(row_id, json.loads(row)) for row_id, row, _ in rows], None
+        return [], wait
+
+    def _send(self, batch):
+        try:
+            if self.worksheet is None:
+                self.worksheet = self.open_worksheet()
+            if self.uncertain:
+                present = set(self.worksheet.col_values(len(batch[0][1]) + 1))
+                sent = [row_id for row_id, _ in batch if row_id in present]
+                batch = [(row_id, row) for row_id, row in batch if row_id not in present]
+                self._mark_sent(sent)
+                self.rows_deduplicated += len(sent)
+                self.uncertain = False
+            if batch:
+                self.uncertain = True
+                self.worksheet.append_rows([row + [row_id] for row_id, row in batch])
+                self._mark_sent([row_id for row_id, _ in batch])
+                self.uncertain = False
+                self.rows_written += len(batch)
+                self.batches += 1
+            self.failures = 0
+            return True
+        except Exception as e:
+            self.last_error = str(e)
+            self.failures += 1
+            # Quota and server errors are worth waiting out; anything else may be an expired
+            # or revoked authorization, so reconnect on the next attempt
+            code = getattr(e, 'code', None)
+            if not (isinstance(code, int) and (code == 429 or code >= 500)):
+                self.worksheet = None
+            return False
+
+    def _mark_sent(self, row_ids):
+        if not row_ids:
+            return
+        with self.condition:
+            self.conn.executemany("DELETE FROM outbox WHERE id = ?", [(row_id,) for row_id in row_ids])
+            self.conn.commit()
+
+
+# An outbox that cannot be opened (e.g. an unwritable directory) only disables saving to Sheets;
+# append_result_row then raises with the reason, which the app reports with the result
+try:
+    _outbox = SheetOutbox(SHEETS_OUTBOX_PATH, open_worksheet, SHEETS_BATCH_SIZE, SHEETS_FLUSH_INTERVAL, SHEETS_RETRY_DELAY)
+    _outbox_error = None
+except (OSError, sqlite3.Error) as e:
+    _outbox = None
+    _outbox_error = f"Could not open the results outbox at {SHEETS_OUTBOX_PATH}: {e}"
+    print(_outbox_error, file=sys.stderr)
+if _outbox is not None:
+    if sheets_configured():
+        _outbox.start()
+    atexit.register(_outbox.close)
+
+
+def append_result_row(row):
+    # Durable once this returns; the row reaches the sheet within SHEETS_FLUSH_INTERVAL seconds while Sheets is up
+    if _outbox is None:
+        raise RuntimeError(_outbox_error)
+    return _outbox.append(row)
+
+def get_outbox_stats():
+    # None when the outbox could not be opened
+    return _outbox.stats() if _outbox is not None else None
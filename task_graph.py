@@ -0,0 +1,73 @@
+# task_graph.py
+# Minimal dependency-graph scheduler: each task starts as soon as the tasks it depends on have
+# finished, on a thread pool, and records when it started and finished.
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class TaskGraph:
+    def __init__(self):
+        self.tasks = {}
+
+    def add(self, name, fn, *dependencies):
+        # fn is called with the results of `dependencies`, in order
+        if name in self.tasks:
+            raise ValueError(f"Task '{name}' is already defined")
+        missing = [dependency for dependency in dependencies if dependency not in self.tasks]
+        if missing:
+            raise ValueError(f"Task '{name}' depends on undefined tasks {missing}")
+        self.tasks[name] = (fn, dependencies)
+        return self
+
+    def run(self, max_workers=None, on_done=None):
+        # Returns ({task: result}, {task: (start, end)}) with times in seconds from the start of the run.
+        # on_done(task, result) is called as each task finishes, e.g. to report progress.
+        # The first task to fail cancels everything not yet started and its exception is re-raised
+        # straight away; tasks already running (e.g. a slow API call) finish on their own.
+        results = {}
+        timings = {}
+        started = time.perf_counter()
+
+        def timed(name, fn):
+            def call(*args):
+                start = time.perf_counter() - started
+                try:
+                    return fn(*args)
+                finally:
+                    timings[name] = (start, time.perf_counter() - started)
+            return call
+
+        executor = ThreadPoolExecutor(max_workers=max_workers or len(self.tasks) or 1)
+        try:
+            pending = dict(self.tasks)
+            running = {}
+            while pending or running:
+                for name, (fn, dependencies) in list(pending.items()):
+                    if all(dependency in results for dependency in dependencies):
+                        running[executor.submit(timed(name, fn), *(results[d] for d in dependencies))] = name
+                        del pending[name]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        raise error
+                    results[name] = future.result()
+                    if on_done:
+                        on_done(name, results[name])
+        finally:
+            # Nothing is left running after a successful run, so this only skips waiting after a failure
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results, timings
+
+
+def critical_path(graph, timings):
+    # The chain of tasks that determined the total run time, in execution order
+    path = []
+    name = max(timings, key=lambda task: timings[task][1]) if timings else None
+    while name is not None:
+        path.append(name)
+        dependencies = graph.tasks[name][1]
+        name = max(dependencies, key=lambda task: timings[task][1]) if dependencies else None
+    return path[::-1]
@@ -0,0 +1,73 @@
+import json
+import random
+
+import pytest
+
+import bulk_score
+from questionnaire import questions, aptitude_questions, career_clusters
+from recommender import recommend_careers_batch, MATCH_DIMENSIONS
+from responses import ResponseVector
+from scoring import prepare_client_profile, SECTION_TRAITS
+
+
+def make_row(seed):
+    # Random answers with some items left unanswered, plus saved aptitude percentages as archived
+    rng = random.Random(seed)
+    row = {'name': f"User {seed}", 'email': f"user{seed}@example.com", 'age': 14 + seed % 10,
+           'class_or_occupation': 'College', 'hobbies': 'Reading, Chess', 'interests': 'AI'}
+    for section in ['RIASEC', 'OCEAN', 'Hofstede']:
+        answers = row.setdefault(section, {})
+        for trait, items in questions[section].items():
+            for i, (_, options) in enumerate(items, 1):
+                if rng.random() < 0.85:
+                    answers[f"{section}_{trait}_{i}"] = rng.choice(options)
+    row['Aptitude'] = {trait: rng.choice([0, 12.5, 50, 75, 100]) for trait in aptitude_questions}
+    return row
+
+
+ROWS = [make_row(seed) for seed in range(40)] + [{'name': 'Empty'}]
+
+
+def test_prepare_profiles_matches_per_row_profiles():
+    expected = [prepare_client_profile(row) for row in ROWS]
+    actual = bulk_score.prepare_profiles(ROWS)
+    for want, got in zip(expected, actual):
+        assert list(got) == list(want)
+        for key, value in want.items():
+            if key in SECTION_TRAITS:
+                assert got[key] == pytest.approx(value)
+            else:
+                assert got[key] == value
+
+
+def test_score_chunk_matches_per_row_output():
+    profiles = [prepare_client_profile(row) for row in ROWS]
+    recommendations = recommend_careers_batch(profiles, career_clusters, MATCH_DIMENSIONS, 5)
+    lines = bulk_score.score_chunk(100, ROWS, MATCH_DIMENSIONS, 5)
+    for i, (line, profile, ranked) in enumerate(zip(lines, profiles, recommendations)):
+        record = json.loads(line)
+        assert record['row'] == 100 + i
+        assert [career for career, _, _ in record['recommendations']] == [career for career, _, _ in ranked]
+        assert [score for _, score, _ in record['recommendations']] == pytest.approx([score for _, score, _ in ranked])
+
+
+def test_invalid_answer_is_rejected():
+    row = make_row(0)
+    row['OCEAN']['OCEAN_Openness_1'] = 'Not an option'
+    with pytest.raises(ValueError):
+        bulk_score.prepare_profiles([row])
+
+
+def test_encoded_responses_match_per_row_profiles():
+    rows = []
+    for seed, row in enumerate(ROWS[:10]):
+        vector = ResponseVector.from_user_data(row)
+        for trait, items in aptitude_questions.items():
+            for i, (_, options, _) in enumerate(items, 1):
+                vector.set(f"aptitude_{trait}_{i}", options[(seed + i) % len(options)])
+        rows.append((row, vector))
+    encoded = [{'name': row['name'], 'responses': vector.to_bytes().hex()} for row, vector in rows]
+    for (row, vector), profile in zip(rows, bulk_score.prepare_profiles(encoded)):
+        expected = prepare_client_profile({'name': row['name']}, vector)
+        for section in SECTION_TRAITS:
+            assert profile[section] == pytest.approx(expected[section])
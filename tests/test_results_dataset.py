@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import results_dataset
+from questionnaire import career_clusters
+from recommender import recommend_careers
+from scoring import SECTION_TRAITS
+
+
+def make_record(name):
+    profile = {'name': name, 'email': f"{name}@example.com", 'age': 17, 'status': '11-12th'}
+    for section, traits in SECTION_TRAITS.items():
+        profile[section] = {trait: 5.0 for trait in traits}
+    return results_dataset.result_record(profile, recommend_careers(profile, career_clusters))
+
+
+def wait_for_rows(path, count, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            rows = results_dataset.load_results(['name'], path=path).num_rows
+        except (FileNotFoundError, OSError):
+            rows = 0
+        if rows >= count:
+            return rows
+        time.sleep(0.05)
+    return rows
+
+
+def test_flush_interval_applies_to_every_batch(tmp_path):
+    writer = results_dataset.ResultsWriter(str(tmp_path), batch_size=100, flush_interval=0.3)
+    try:
+        writer.append(make_record('first'))
+        assert wait_for_rows(str(tmp_path), 1, timeout=2) == 1
+
+        # The buffer is empty again; a record below batch_size must still be written after the interval
+        writer.append(make_record('second'))
+        assert wait_for_rows(str(tmp_path), 2, timeout=2) == 2
+        assert not writer.pending
+    finally:
+        writer.close()
+
+
+def test_failed_write_is_retried(tmp_path):
+    blocker = tmp_path / 'blocker'
+    blocker.write_text('')
+    writer = results_dataset.ResultsWriter(str(blocker / 'dataset'), batch_size=1, flush_interval=0.1, max_pending=3, retry_delay=0.1)
+    try:
+        for name in ['a', 'b', 'c', 'd']:
+            writer.append(make_record(name))
+        time.sleep(0.5)
+        assert writer.thread.is_alive()
+        assert writer.failures > 0
+        assert len(writer.pending) <= 3
+
+        writer.path = str(tmp_path / 'dataset')
+        assert wait_for_rows(writer.path, 3, timeout=5) == 3
+    finally:
+        writer.close()